@@ -0,0 +1,300 @@
+import asyncio
+import datetime
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from tdl.queue.abstractions.response.fatal_error_response import FatalErrorResponse
+from tdl.queue.abstractions.response.valid_response import ValidResponse
+from tdl.queue.processing_rules import ProcessingRules
+from tdl.queue.queue_based_implementation_runner import QueueBasedImplementationRunnerAudit
+from tdl.queue.transport.remote_broker import RemoteBroker
+
+from runner.replay import LatencyHistogram
+from runner.solution_registry import default_registry, to_wire
+
+DEFAULT_MAX_IN_FLIGHT = 16
+
+
+class AsyncQueueBasedImplementationRunner:
+    """
+    A drop-in alternative to tdl's QueueBasedImplementationRunner that works on several requests at once.
+
+    Requests are handed to an asyncio loop on a background thread as they arrive. Each solution call runs on an
+    executor, so a slow request no longer holds up the ones behind it, with at most max_in_flight requests being
+    worked on at a time. Responses are still acknowledged and published in the order the requests arrived.
+    Throughput and latency stats are logged when the runner stops and left in self.stats.
+
+    With process_pool set to (max_workers, registry_factory), the registered solutions run in worker processes
+    instead. Solution callables often cannot be pickled, so only the method name and params are sent and each worker
+    looks the solution up in its own registry.
+    """
+
+    def __init__(self, config, deploy_processing_rules, max_in_flight=DEFAULT_MAX_IN_FLIGHT, executor=None,
+                 process_pool=None):
+        self._config = config
+        self._deploy_processing_rules = deploy_processing_rules
+        self._audit = QueueBasedImplementationRunnerAudit(config.get_audit_stream())
+        self._max_in_flight = max_in_flight
+        self._executor = executor
+        self._process_pool = process_pool
+        self.total_processing_time_millis = None
+        self.stats = None
+
+    def run(self):
+        start_time = datetime.datetime.now()
+        worker_methods = ()
+        if self._process_pool is not None:
+            max_workers, registry_factory = self._process_pool
+            executor = ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(registry_factory,))
+            worker_methods = registry_factory().method_names()
+        else:
+            executor = self._executor or ThreadPoolExecutor(max_workers=self._max_in_flight)
+        loop = asyncio.new_event_loop()
+        loop_thread = threading.Thread(target=loop.run_forever, name='async-runner-loop', daemon=True)
+        loop_thread.start()
+        handler = AsyncApplyProcessingRules(self._deploy_processing_rules, self._audit, loop, executor,
+                                            self._max_in_flight, worker_methods)
+
+        try:
+            self._audit.log_line('Starting client')
+
+            remote_broker = AsyncRemoteBroker(
+                handler,
+                self._config.get_hostname(),
+                self._config.get_port(),
+                self._config.get_request_queue_name(),
+                self._config.get_response_queue_name(),
+                self._config.get_time_to_wait_for_request())
+
+            self._audit.log_line('Waiting for requests')
+
+            remote_broker.subscribe(handler, self._audit)
+
+            # DEBT - this is just to block.
+            while remote_broker.is_connected():
+                time.sleep(0.1)
+
+            self._audit.log_line('Stopping client')
+        except Exception as e:
+            self._audit.log_exception('There was a problem processing messages', e)
+        finally:
+            handler.drain()
+            loop.call_soon_threadsafe(loop.stop)
+            loop_thread.join()
+            loop.close()
+            if executor is not self._executor:
+                executor.shutdown()
+
+        end_time = datetime.datetime.now()
+
+        self.total_processing_time_millis = (end_time - start_time).total_seconds() * 1000.00
+        self.stats = handler.stats(self.total_processing_time_millis / 1000.0)
+        self._audit.log_line(format_stats(self.stats))
+
+    def get_request_timeout_millis(self):
+        return self._config.get_time_to_wait_for_request()
+
+
+class AsyncQueueBasedImplementationRunnerBuilder:
+    """
+    Same interface as tdl's QueueBasedImplementationRunnerBuilder, plus the concurrency settings
+    """
+
+    def __init__(self):
+        self._deploy_processing_rules = ProcessingRules()
+        self._config = None
+        self._max_in_flight = DEFAULT_MAX_IN_FLIGHT
+        self._executor = None
+        self._process_pool = None
+
+        self._deploy_processing_rules.\
+            on('display_description').\
+            call(lambda *_: 'OK').\
+            build()
+
+    def set_config(self, config):
+        self._config = config
+        return self
+
+    def with_solution_for(self, method_name, user_implementation):
+        self._deploy_processing_rules.\
+            on(method_name).\
+            call(user_implementation).\
+            build()
+        return self
+
+    def with_max_in_flight(self, max_in_flight):
+        self._max_in_flight = max_in_flight
+        return self
+
+    def with_executor(self, executor):
+        """
+        Executor the solutions run on, which must run them in this process. Defaults to a thread pool with one thread
+        per request in flight.
+        """
+        self._executor = executor
+        return self
+
+    def with_process_pool(self, max_workers=None, registry_factory=default_registry):
+        """
+        Run the solutions in registry_factory() on a pool of worker processes, for CPU heavy solutions. Each worker
+        builds its own registry, so registry_factory must be a module level function. Methods the registry does not
+        know, such as display_description, still run in this process.
+        """
+        self._process_pool = (max_workers, registry_factory)
+        return self
+
+    def create(self):
+        return AsyncQueueBasedImplementationRunner(
+            self._config, self._deploy_processing_rules, self._max_in_flight, self._executor, self._process_pool)
+
+
+class AsyncRemoteBroker(RemoteBroker):
+    """
+    The idle timer that closes the connection only starts once no requests are in flight, rather than as soon as
+    the last request has been handed over.
+
+    The listener stops the timer before handing a request over, so the handler is marked busy right then, under the
+    same lock. Otherwise the last request in flight could finish in between and restart the timer.
+    """
+
+    def __init__(self, handler, *args):
+        super().__init__(*args)
+        self._handler = handler
+        self._timer_lock = threading.Lock()
+        handler.on_idle = self.start_timer
+
+    def start_timer(self):
+        # Both the listener and the last request to finish may get here, only one timer may be left running
+        with self._timer_lock:
+            if self._handler.is_idle():
+                super().stop_timer()
+                super().start_timer()
+
+    def stop_timer(self):
+        with self._timer_lock:
+            self._handler.expect_request()
+            super().stop_timer()
+
+
+class AsyncApplyProcessingRules:
+
+    def __init__(self, processing_rules, audit, loop, executor, max_in_flight, worker_methods=()):
+        self._processing_rules = processing_rules
+        self._audit = audit
+        self._loop = loop
+        self._executor = executor
+        # Methods run by name on executor's worker processes, see _call_solution
+        self._worker_methods = frozenset(worker_methods)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # Set between the listener stopping the idle timer and the request it received being handed over
+        self._arriving = False
+        self._stopped = False
+        # Completes once the most recently received request has been responded to
+        self._last_done = None
+        # Only recorded on the loop thread
+        self._latencies = LatencyHistogram()
+        self.on_idle = None
+
+    def is_idle(self):
+        with self._lock:
+            return self._in_flight == 0 and not self._arriving
+
+    def expect_request(self):
+        with self._lock:
+            self._arriving = True
+
+    def process_next_request_from(self, remote_broker, headers, request):
+        # Blocks the broker's receiving thread once max_in_flight requests are being worked on
+        self._slots.acquire()
+        with self._lock:
+            self._in_flight += 1
+            self._arriving = False
+        # Requests arrive one at a time on that thread, so each one can simply wait on the one received before it
+        self._last_done = asyncio.run_coroutine_threadsafe(
+            self._handle(remote_broker, headers, request, self._last_done, time.perf_counter()), self._loop)
+
+    def drain(self):
+        """
+        Wait for every request received so far to be responded to
+        """
+        if self._last_done is not None:
+            wait([self._last_done])
+
+    def stats(self, elapsed_seconds):
+        latencies = self._latencies
+        return {
+            'requests': latencies.count,
+            'elapsed_seconds': elapsed_seconds,
+            'requests_per_second': latencies.count / elapsed_seconds if elapsed_seconds else 0.0,
+            'latency_p50_ms': latencies.percentile(0.5) * 1000,
+            'latency_p99_ms': latencies.percentile(0.99) * 1000,
+            'latency_max_ms': latencies.max * 1000,
+        }
+
+    async def _handle(self, remote_broker, headers, request, previous_done, received):
+        try:
+            response = await self._get_response(request)
+            if previous_done is not None:
+                await asyncio.wait([asyncio.wrap_future(previous_done)])
+            self._respond(remote_broker, headers, request, response)
+            self._latencies.record(time.perf_counter() - received)
+        except Exception as e:
+            self._audit.log_exception('There was a problem processing request {}'.format(request.id), e)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                idle = self._in_flight == 0
+            self._slots.release()
+            # Also after a fatal error, as tdl's listener does, so the idle timer still closes the connection
+            if idle and self.on_idle is not None:
+                self.on_idle()
+
+    async def _get_response(self, request):
+        if request.method not in self._worker_methods:
+            executor = None if self._worker_methods else self._executor
+            return await self._loop.run_in_executor(executor, self._processing_rules.get_response_for, request)
+        # Same responses as ProcessingRules.get_response_for
+        try:
+            result = await self._loop.run_in_executor(self._executor, _call_solution, request.method, request.params)
+            return ValidResponse(request.id, result)
+        except Exception as e:
+            print(getattr(e, 'message', str(e)))
+            return FatalErrorResponse('user implementation raised exception')
+
+    def _respond(self, remote_broker, headers, request, response):
+        if self._stopped:
+            return
+        self._audit.start_line()
+        self._audit.log(request)
+        self._audit.log(response)
+
+        if isinstance(response, FatalErrorResponse):
+            self._stopped = True
+            remote_broker.stop()
+            self._audit.end_line()
+            return
+
+        remote_broker.respond_to(headers, response)
+        self._audit.end_line()
+
+
+# The registry of the worker process this module is loaded in, set by _init_worker
+_worker_registry = None
+
+
+def _init_worker(registry_factory):
+    global _worker_registry
+    _worker_registry = registry_factory()
+
+
+def _call_solution(method_name, params):
+    return to_wire(_worker_registry.resolve(method_name)(*params))
+
+
+def format_stats(stats):
+    return 'Processed {requests} requests in {elapsed_seconds:.2f}s ({requests_per_second:.1f}/s), ' \
+           'latency p50 {latency_p50_ms:.2f}ms, p99 {latency_p99_ms:.2f}ms, max {latency_max_ms:.2f}ms'.format(**stats)
@@ -1,4 +1,10 @@
 import os
+from types import MappingProxyType
+
+CONFIG_FILE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "config", "credentials.config")
+
+# (modification time, properties) for the last parse of the config file
+_cached_properties = None
 
 
 def read_from_config_file(key):
@@ -11,13 +17,31 @@ def read_from_config_file_with_default(key, default_value):
     return properties.get(key, default_value)
 
 
+def read_config():
+    """
+    Return every property as a read-only mapping, for callers needing several keys at once.
+    """
+    return read_properties_file()
+
+
 # ~~~~ Helpers
 
 
 def read_properties_file():
-    current_dir = os.path.dirname(__file__)
-    properties = load_properties(os.path.join(current_dir, "..", "..", "config", "credentials.config"))
-    return properties
+    """
+    Parse the config file once and keep the result, re-reading it only when its modification time changes.
+    """
+    global _cached_properties
+    try:
+        modified = os.stat(CONFIG_FILE_PATH).st_mtime_ns
+    except OSError:
+        modified = None
+
+    cached = _cached_properties
+    if cached is None or modified is None or cached[0] != modified:
+        cached = (modified, MappingProxyType(load_properties(CONFIG_FILE_PATH)))
+        _cached_properties = cached
+    return cached[1]
 
 
 def load_properties(filepath, sep='=', comment_char='#'):
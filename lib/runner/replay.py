@@ -0,0 +1,222 @@
+"""
+Replay a recorded request log against the local solutions, with no server involved.
+
+The log is JSON lines in the server's request format, optionally carrying the expected result:
+
+    {"method": "checkout", "params": ["AAAB"], "id": "CHK_R1_001", "expected": 160}
+
+Lines are read and dispatched one at a time through the solution registry, so memory use does not grow with the size
+of the log. Latencies go into fixed size histograms per method and only the first few mismatches and errors are kept.
+
+    PYTHONPATH=lib python -m runner.replay traffic.jsonl [--json] [--max-mismatches N]
+"""
+import argparse
+import json
+import math
+import sys
+import time
+
+from runner.solution_registry import default_registry, to_wire
+
+DEFAULT_MAX_MISMATCHES = 20
+
+# Latency buckets are a quarter of a power of two wide, from 1us up to about 70s
+BUCKETS_PER_DOUBLING = 4
+NUM_BUCKETS = 26 * BUCKETS_PER_DOUBLING
+MIN_LATENCY = 1e-6
+
+
+class LatencyHistogram:
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if seconds <= MIN_LATENCY:
+            bucket = 0
+        else:
+            bucket = min(NUM_BUCKETS - 1, int(math.log2(seconds / MIN_LATENCY) * BUCKETS_PER_DOUBLING) + 1)
+        self.counts[bucket] += 1
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket holding the given fraction of the samples, in seconds
+        """
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.max, MIN_LATENCY * 2 ** (bucket / BUCKETS_PER_DOUBLING))
+        return self.max
+
+
+class ReplayReport:
+
+    def __init__(self, max_mismatches=DEFAULT_MAX_MISMATCHES):
+        self.max_mismatches = max_mismatches
+        self.requests = 0
+        self.checked = 0
+        self.mismatch_count = 0
+        self.error_count = 0
+        self.invalid_lines = 0
+        self.elapsed = 0.0
+        self.mismatches = []
+        self.errors = []
+        self.latencies = {}
+
+    @property
+    def ok(self):
+        return not (self.mismatch_count or self.error_count or self.invalid_lines)
+
+    def record_mismatch(self, line_number, request, actual):
+        self.mismatch_count += 1
+        if len(self.mismatches) < self.max_mismatches:
+            self.mismatches.append({
+                'line': line_number,
+                'id': request.get('id'),
+                'method': request['method'],
+                'params': request['params'],
+                'expected': request['expected'],
+                'actual': actual,
+            })
+
+    def record_error(self, line_number, request, exception):
+        self.error_count += 1
+        if len(self.errors) < self.max_mismatches:
+            self.errors.append({
+                'line': line_number,
+                'id': request.get('id'),
+                'method': request['method'],
+                'params': request['params'],
+                'error': '{}: {}'.format(type(exception).__name__, exception),
+            })
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'checked': self.checked,
+            'mismatches': self.mismatch_count,
+            'errors': self.error_count,
+            'invalid_lines': self.invalid_lines,
+            'elapsed_seconds': self.elapsed,
+            'requests_per_second': self.requests / self.elapsed if self.elapsed else 0.0,
+            'methods': {
+                method: {
+                    'requests': histogram.count,
+                    'mean_ms': histogram.total / histogram.count * 1000,
+                    'p50_ms': histogram.percentile(0.5) * 1000,
+                    'p99_ms': histogram.percentile(0.99) * 1000,
+                    'max_ms': histogram.max * 1000,
+                }
+                for method, histogram in sorted(self.latencies.items())
+            },
+            'first_mismatches': self.mismatches,
+            'first_errors': self.errors,
+        }
+
+    def format(self):
+        summary = self.as_dict()
+        lines = [
+            'Replayed {requests} requests in {elapsed_seconds:.2f}s ({requests_per_second:.0f}/s): {checked} checked, '
+            '{mismatches} mismatches, {errors} errors, {invalid_lines} invalid lines'.format(**summary),
+            '{:<12} {:>10} {:>10} {:>10} {:>10}'.format('method', 'requests', 'p50 ms', 'p99 ms', 'max ms'),
+        ]
+        for method, stats in summary['methods'].items():
+            lines.append('{:<12} {requests:>10} {p50_ms:>10.3f} {p99_ms:>10.3f} {max_ms:>10.3f}'.format(
+                method, **stats))
+        for mismatch in self.mismatches:
+            lines.append('line {line} ({id}): {method}{params} expected {expected!r}, got {actual!r}'.format(
+                line=mismatch['line'], id=mismatch['id'], method=mismatch['method'],
+                params=tuple(mismatch['params']), expected=mismatch['expected'], actual=mismatch['actual']))
+        for error in self.errors:
+            lines.append('line {line} ({id}): {method}{params} raised {error}'.format(
+                line=error['line'], id=error['id'], method=error['method'], params=tuple(error['params']),
+                error=error['error']))
+        return '\n'.join(lines)
+
+
+def replay(lines, registry=None, max_mismatches=DEFAULT_MAX_MISMATCHES):
+    """
+    Replay an iterable of JSON request lines, returning a ReplayReport
+    """
+    registry = registry or default_registry()
+    known_methods = set(registry.method_names())
+    report = ReplayReport(max_mismatches)
+    clock = time.perf_counter
+    started = clock()
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            method = request['method']
+            params = request['params']
+        except (ValueError, TypeError, KeyError):
+            report.invalid_lines += 1
+            continue
+        if not isinstance(method, str) or method not in known_methods or not isinstance(params, list):
+            report.invalid_lines += 1
+            continue
+
+        report.requests += 1
+        try:
+            # Importing the solution on its first request is not counted in its latency
+            implementation = registry.resolve(method)
+            call_started = clock()
+            result = implementation(*params)
+            latency = clock() - call_started
+        except Exception as e:
+            report.record_error(line_number, request, e)
+            continue
+
+        histogram = report.latencies.get(method)
+        if histogram is None:
+            histogram = report.latencies[method] = LatencyHistogram()
+        histogram.record(latency)
+
+        if 'expected' in request:
+            report.checked += 1
+            result = to_wire(result)
+            if result != request['expected']:
+                report.record_mismatch(line_number, request, result)
+
+    report.elapsed = clock() - started
+    return report
+
+
+def replay_file(path, registry=None, max_mismatches=DEFAULT_MAX_MISMATCHES):
+    if path == '-':
+        return replay(sys.stdin, registry, max_mismatches)
+    with open(path, encoding='utf-8') as f:
+        return replay(f, registry, max_mismatches)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a JSON lines request log against the local solutions')
+    parser.add_argument('path', help="request log, or '-' for stdin")
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--max-mismatches', type=int, default=DEFAULT_MAX_MISMATCHES,
+                        help='number of mismatches, and of errors, to list in full')
+    args = parser.parse_args(argv)
+
+    report = replay_file(args.path, max_mismatches=args.max_mismatches)
+    if args.json:
+        print(json.dumps(report.as_dict(), indent=2))
+    else:
+        print(report.format())
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
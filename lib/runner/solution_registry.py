@@ -0,0 +1,89 @@
+import importlib
+import sys
+import time
+from collections.abc import Sequence
+
+# Method name the server calls -> 'dotted.module.path:function' implementing it
+SOLUTIONS = {
+    'sum': 'solutions.SUM.sum_solution:compute',
+    'hello': 'solutions.HLO.hello_solution:hello',
+    'array_sum': 'solutions.ARRS.array_sum:compute',
+    'int_range': 'solutions.IRNG.int_range:generate',
+    'fizz_buzz': 'solutions.FIZ.fizz_buzz_solution:fizz_buzz',
+    'checkout': 'solutions.CHK.checkout_solution:checkout',
+    'checklite': 'solutions.CHL.checklite_solution:checklite',
+}
+
+
+class SolutionRegistry:
+    """
+    Solutions declared by dotted path and only imported when a request for them first arrives.
+
+    Every import made through the registry is timed, so the cost of each module shows up in import_timings.
+    """
+
+    def __init__(self, solutions=None):
+        self._paths = dict(solutions or {})
+        self._resolved = {}
+        # Module name -> seconds spent importing it, including anything it imported in turn
+        self.import_timings = {}
+
+    def declare(self, method_name, dotted_path):
+        self._paths[method_name] = dotted_path
+        self._resolved.pop(method_name, None)
+        return self
+
+    def method_names(self):
+        return list(self._paths)
+
+    def resolve(self, method_name):
+        implementation = self._resolved.get(method_name)
+        if implementation is None:
+            module_name, attribute = self._paths[method_name].split(':')
+            implementation = getattr(self.import_module(module_name), attribute)
+            self._resolved[method_name] = implementation
+        return implementation
+
+    def lazy(self, method_name):
+        """
+        Return a callable standing in for the solution, which imports it on the first call
+        """
+        if method_name not in self._paths:
+            raise KeyError(method_name)
+
+        def call(*args):
+            return to_wire(self.resolve(method_name)(*args))
+
+        call.__name__ = method_name
+        return call
+
+    def import_module(self, module_name):
+        module = sys.modules.get(module_name)
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            self.import_timings[module_name] = time.perf_counter() - start
+        return module
+
+    def format_import_timings(self):
+        """
+        Return the import timings as a table in the style of python -X importtime, slowest first
+        """
+        lines = ['import time: cumulative [us] | module']
+        for module_name, seconds in sorted(self.import_timings.items(), key=lambda item: -item[1]):
+            lines.append('import time: {:>15} | {}'.format(int(seconds * 1e6), module_name))
+        return '\n'.join(lines)
+
+
+def to_wire(result):
+    """
+    Return a result in a form the server's JSON encoder accepts. Lazy sequences returned by solutions, such as
+    int_range's IntRange, become lists here at the boundary and nowhere earlier.
+    """
+    if isinstance(result, Sequence) and not isinstance(result, (str, list, tuple)):
+        return list(result)
+    return result
+
+
+def default_registry():
+    return SolutionRegistry(SOLUTIONS)
@@ -1,16 +1,19 @@
+import os
 import sys
-from tdl.queue.queue_based_implementation_runner import QueueBasedImplementationRunnerBuilder
-from tdl.runner.challenge_session import ChallengeSession
-from solutions.SUM import sum_solution
-from solutions.HLO import hello_solution
-from solutions.ARRS import array_sum
-from solutions.IRNG import int_range
-from solutions.FIZ import fizz_buzz_solution
-from solutions.CHK import checkout_solution
-from solutions.CHL import checklite_solution
-from runner.utils import Utils
+from runner.solution_registry import default_registry
 from runner.user_input_action import get_user_input
 
+# Solutions are only imported when the first request for them arrives
+registry = default_registry()
+if os.environ.get('RUNNER_ASYNC'):
+    QueueBasedImplementationRunnerBuilder = registry.import_module(
+        'runner.async_runner').AsyncQueueBasedImplementationRunnerBuilder
+else:
+    QueueBasedImplementationRunnerBuilder = registry.import_module(
+        'tdl.queue.queue_based_implementation_runner').QueueBasedImplementationRunnerBuilder
+ChallengeSession = registry.import_module('tdl.runner.challenge_session').ChallengeSession
+Utils = registry.import_module('runner.utils').Utils
+
 
 """
   ~~~~~~~~~~ Running the system: ~~~~~~~~~~~~~
@@ -23,6 +26,15 @@ from runner.user_input_action import get_user_input
  
     To run your unit tests locally:
        PYTHONPATH=lib python -m pytest -q test/solution_tests/
+
+    To see how long each module took to import:
+       RUNNER_IMPORT_TIMINGS=1 PYTHONPATH=lib python lib/send_command_to_server.py
+
+    To work on several requests at once, responding in order (RUNNER_MAX_IN_FLIGHT defaults to 16):
+       RUNNER_ASYNC=1 RUNNER_MAX_IN_FLIGHT=32 PYTHONPATH=lib python lib/send_command_to_server.py
+
+    To also run the solutions on a pool of worker processes (RUNNER_PROCESSES is the number of workers):
+       RUNNER_ASYNC=1 RUNNER_PROCESSES=4 PYTHONPATH=lib python lib/send_command_to_server.py
  
   ~~~~~~~~~~ The workflow ~~~~~~~~~~~~~
  
@@ -55,19 +67,21 @@ from runner.user_input_action import get_user_input
  
 """
 
-runner = QueueBasedImplementationRunnerBuilder()\
-    .set_config(Utils.get_runner_config())\
-    .with_solution_for('sum', sum_solution.compute)\
-    .with_solution_for('hello', hello_solution.hello)\
-    .with_solution_for('array_sum', array_sum.compute)\
-    .with_solution_for('int_range', int_range.generate)\
-    .with_solution_for('fizz_buzz', fizz_buzz_solution.fizz_buzz)\
-    .with_solution_for('checkout', checkout_solution.checkout)\
-    .with_solution_for('checklite', checklite_solution.checklite)\
-    .create()
+runner_builder = QueueBasedImplementationRunnerBuilder()\
+    .set_config(Utils.get_runner_config())
+for method_name in registry.method_names():
+    runner_builder.with_solution_for(method_name, registry.lazy(method_name))
+if os.environ.get('RUNNER_ASYNC') and os.environ.get('RUNNER_MAX_IN_FLIGHT'):
+    runner_builder.with_max_in_flight(int(os.environ['RUNNER_MAX_IN_FLIGHT']))
+if os.environ.get('RUNNER_ASYNC') and os.environ.get('RUNNER_PROCESSES'):
+    runner_builder.with_process_pool(int(os.environ['RUNNER_PROCESSES']))
+runner = runner_builder.create()
 
 ChallengeSession\
     .for_runner(runner)\
     .with_config(Utils.get_config())\
     .with_action_provider(lambda: get_user_input(sys.argv[1:]))\
     .start()
+
+if os.environ.get('RUNNER_IMPORT_TIMINGS'):
+    print(registry.format_import_timings(), file=sys.stderr)
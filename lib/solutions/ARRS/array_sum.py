@@ -1,3 +1,69 @@
+"""
+Exact sum of an integer array, whatever container it arrives in.
+
+Lists and tuples go to the builtin sum, which is exact and already runs in C. NumPy arrays, array.array, bytes and any
+other object exposing an integer buffer are summed in place through a NumPy view, one chunk at a time. Each chunk is
+summed twice: in fixed width integers, which wrap but are exact modulo 2**64, and in floats, which are only
+approximate but cannot overflow. When the float sum shows the true sum fits in 63 bits the integer sum is exact.
+Otherwise the chunk is split into high and low 32 bit halves that are summed separately. Anything else is summed item
+by item.
+"""
+import numpy as np
+
+# Elements summed per chunk. Small enough that the float sum of a chunk stays far more accurate than the margin below
+# 2**63 it is compared against, and that the halves of a split chunk cannot overflow int64.
+CHUNK_SIZE = 1 << 22
+
+# Below this magnitude a float sum proves the wrapped integer sum is exact
+_SAFE_MAGNITUDE = 2.0 ** 62
+
+_LOW_MASK = (1 << 32) - 1
+
+
 # noinspection PyUnusedLocal
 def compute(int_array):
-    raise NotImplementedError()
+    if type(int_array) in (list, tuple):
+        return sum(int_array)
+
+    values = _integer_view(int_array)
+    if values is None:
+        return sum(int_array)
+
+    total = 0
+    for start in range(0, len(values), CHUNK_SIZE):
+        total += _sum_chunk(values[start:start + CHUNK_SIZE])
+    return total
+
+
+# ~~~~ Helpers
+
+def _integer_view(obj):
+    """
+    Return a flat NumPy view of obj's integers without copying them, or None if obj is not an integer buffer
+    """
+    if not isinstance(obj, np.ndarray):
+        try:
+            obj = np.asarray(memoryview(obj))
+        except (TypeError, ValueError):
+            return None
+    if obj.dtype.kind == 'b':
+        obj = obj.view(np.uint8)
+    elif obj.dtype.kind not in 'iu':
+        return None
+    # ravel only copies when the view is not contiguous
+    return obj.ravel()
+
+
+def _sum_chunk(chunk):
+    if chunk.dtype.itemsize < 8:
+        # At most CHUNK_SIZE values below 2**32 cannot overflow a 64 bit sum
+        return int(chunk.sum(dtype=np.int64 if chunk.dtype.kind == 'i' else np.uint64))
+
+    wrapped = int(chunk.sum())
+    estimate = float(chunk.sum(dtype=np.float64))
+    if abs(estimate) < _SAFE_MAGNITUDE:
+        return wrapped
+
+    high = int((chunk >> 32).sum(dtype=np.int64))
+    low = int((chunk & _LOW_MASK).sum(dtype=np.int64))
+    return (high << 32) + low
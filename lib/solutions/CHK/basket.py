@@ -0,0 +1,138 @@
+"""
+A basket that keeps its total up to date as items are scanned.
+
+Rather than re-pricing the whole basket after every scan, each SKU has a precomputed update plan listing the only
+parts of the pipeline its count can influence: the free item offers that read or write it (and, transitively, those
+feeding them), the group offers sharing members with any of those SKUs, and the X-for-Y ladders of every SKU whose
+count may move as a result. A scan replays just that plan and adjusts the running total by the difference.
+"""
+from . import checkout_solution
+from .price_book import NUM_SLOTS, new_counts
+
+
+class Basket:
+
+    def __init__(self, price_book=None):
+        self._book = book = price_book or checkout_solution.get_price_book()
+        # Counts as scanned, after free offers, and after group offers
+        self._counts = new_counts()
+        self._effective = new_counts()
+        self._residual = new_counts()
+        # Cost of each SKU's residual count after its X-for-Y ladder, and the subtotal of each group offer
+        self._line_totals = [0] * NUM_SLOTS
+        self._group_subtotals = [0] * len(book.group_offers)
+        self._total = 0
+        self._plans = [self._plan_for(slot) for slot in range(NUM_SLOTS)]
+
+    @property
+    def total(self):
+        return self._total
+
+    def count(self, sku):
+        return self._counts[self._slot(sku)]
+
+    def __len__(self):
+        return sum(self._counts)
+
+    def add(self, sku):
+        slot = self._slot(sku)
+        self._counts[slot] += 1
+        self._update(slot)
+
+    def remove(self, sku):
+        slot = self._slot(sku)
+        if not self._counts[slot]:
+            raise ValueError('No {!r} in the basket to remove'.format(sku))
+        self._counts[slot] -= 1
+        self._update(slot)
+
+    # ~~~~ Helpers
+
+    def _slot(self, sku):
+        slot = self._book.slot_by_sku.get(sku)
+        if slot is None:
+            raise ValueError('Unrecognised sku {!r}'.format(sku))
+        return slot
+
+    def _plan_for(self, slot):
+        """
+        Return (affected slots, free offers to replay, group offers to replay, slots whose line totals may change)
+        for a change to the count of slot
+        """
+        free_offers = self._book.free_offers
+        written = {offer[1] for offer in free_offers}
+
+        # A change to a trigger changes what its offer makes free. Replaying an offer that writes to an affected
+        # slot also needs the value its trigger had at that point, so a trigger that is itself written to by other
+        # offers has to be replayed too.
+        affected = {slot}
+        grown = True
+        while grown:
+            grown = False
+            for trigger, free, _, _, _ in free_offers:
+                if trigger in affected and free not in affected:
+                    affected.add(free)
+                    grown = True
+                if free in affected and trigger not in affected and trigger in written:
+                    affected.add(trigger)
+                    grown = True
+        replayed_free = tuple(i for i, offer in enumerate(free_offers) if offer[1] in affected)
+
+        # Group offers run in order and overlapping groups read each other's leftovers, so the whole connected set of
+        # groups around the affected slots is replayed
+        group_offers = self._book.group_offers
+        replayed_groups = set()
+        members = set(affected)
+        grown = True
+        while grown:
+            grown = False
+            for i, (group_members, _, _) in enumerate(group_offers):
+                if i not in replayed_groups and members.intersection(group_members):
+                    replayed_groups.add(i)
+                    members.update(group_members)
+                    grown = True
+
+        return tuple(sorted(affected)), replayed_free, tuple(sorted(replayed_groups)), tuple(sorted(members))
+
+    def _update(self, slot):
+        book = self._book
+        counts, effective, residual = self._counts, self._effective, self._residual
+        affected, replayed_free, replayed_groups, lines = self._plans[slot]
+
+        for s in affected:
+            effective[s] = counts[s]
+        for i in replayed_free:
+            trigger, free = book.free_offers[i][:2]
+            remaining = effective[free] - book.free_items_given(i, effective[trigger])
+            effective[free] = remaining if remaining > 0 else 0
+
+        for s in lines:
+            residual[s] = effective[s]
+        change = 0
+        for i in replayed_groups:
+            group_members, amount_required, price = book.group_offers[i]
+            total_offers = sum(residual[s] for s in group_members) // amount_required
+            to_remove = total_offers * amount_required
+            for s in group_members:
+                taken = residual[s] if residual[s] < to_remove else to_remove
+                residual[s] -= taken
+                to_remove -= taken
+            subtotal = price * total_offers
+            change += subtotal - self._group_subtotals[i]
+            self._group_subtotals[i] = subtotal
+
+        for s in lines:
+            line_total = self._line_total(s, residual[s])
+            change += line_total - self._line_totals[s]
+            self._line_totals[s] = line_total
+
+        self._total += change
+
+    def _line_total(self, slot, remaining):
+        total = 0
+        for num_items_required, discounted_price in self._book.ladders[slot]:
+            if remaining >= num_items_required:
+                num_of_discounts = remaining // num_items_required
+                total += num_of_discounts * discounted_price
+                remaining -= num_of_discounts * num_items_required
+        return total + remaining * self._book.unit_prices[slot]
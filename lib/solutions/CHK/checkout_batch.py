@@ -0,0 +1,123 @@
+"""
+Vectorised pricing for many baskets at once.
+
+checkout_many() turns N baskets into a (number of SKUs x N) count matrix in one pass over the concatenated input,
+then runs each offer as a whole-array integer operation. Each stage mirrors the PriceBook stage of the same name, so
+the totals match checkout() exactly.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from . import checkout_solution
+from .price_book import NUM_SLOTS
+
+
+@lru_cache(maxsize=8)
+def _compile(book):
+    """
+    Build the lookup arrays for a price book: a byte to slot map (-1 for bytes that are not SKUs) and the unit prices
+    """
+    slot_by_byte = np.full(256, -1, dtype=np.int64)
+    for sku, slot in book.slot_by_sku.items():
+        if len(sku) != 1 or not sku.isascii():
+            raise ValueError('Batch pricing needs single character ASCII SKUs, got {!r}'.format(sku))
+        slot_by_byte[ord(sku)] = slot
+    unit_prices = np.array(book.unit_prices, dtype=np.int64)
+    return slot_by_byte, unit_prices
+
+
+def build_count_matrix(skus_list, book):
+    """
+    Return (counts, valid) for the baskets passed in. counts is indexed [slot, basket]; valid flags the baskets that
+    were strings made only of known SKUs. Counts for invalid baskets are meaningless.
+    """
+    slot_by_byte, _ = _compile(book)
+    num_baskets = len(skus_list)
+    valid = np.ones(num_baskets, dtype=bool)
+    lengths = np.zeros(num_baskets, dtype=np.int64)
+    encoded = []
+    for row, skus in enumerate(skus_list):
+        if type(skus) == str and skus.isascii():
+            encoded.append(skus)
+            lengths[row] = len(skus)
+        else:
+            valid[row] = False
+
+    data = np.frombuffer(''.join(encoded).encode('ascii'), dtype=np.uint8)
+    slots = slot_by_byte[data]
+    rows = np.repeat(np.arange(num_baskets, dtype=np.int64), lengths)
+
+    unknown = slots < 0
+    if unknown.any():
+        valid[rows[unknown]] = False
+        known = ~unknown
+        slots = slots[known]
+        rows = rows[known]
+
+    counts = np.bincount(
+        slots * num_baskets + rows,
+        minlength=NUM_SLOTS * num_baskets,
+    ).reshape(NUM_SLOTS, num_baskets)
+    return counts, valid
+
+
+def run_free_offers(counts, book):
+    """
+    Note - mutates the input counts
+    """
+    for trigger, free, period, num_free, num_paid in book.free_offers:
+        num_occurrences, leftover = np.divmod(counts[trigger], period)
+        num_given = num_occurrences * num_free + np.maximum(leftover - num_paid, 0)
+        np.maximum(counts[free] - num_given, 0, out=counts[free])
+
+
+def run_group_offers(counts, book):
+    """
+    Return the per-basket subtotal for all group offers applied.
+
+    Note - mutates the input counts
+    """
+    subtotals = np.zeros(counts.shape[1], dtype=np.int64)
+    for members, amount_required, price in book.group_offers:
+        total_offers = counts[list(members)].sum(axis=0) // amount_required
+        to_remove = total_offers * amount_required
+        for slot in members:
+            taken = np.minimum(counts[slot], to_remove)
+            counts[slot] -= taken
+            to_remove -= taken
+        subtotals += total_offers * price
+    return subtotals
+
+
+def run_x_for_y_offers(counts, book):
+    """
+    Return the per-basket subtotal for all 'X skus for Y price' offers applied.
+
+    Note - mutates the input counts
+    """
+    subtotals = np.zeros(counts.shape[1], dtype=np.int64)
+    for slot in book.ladder_slots:
+        remaining = counts[slot]
+        for num_items_required, discounted_price in book.ladders[slot]:
+            num_of_discounts = remaining // num_items_required
+            subtotals += num_of_discounts * discounted_price
+            remaining -= num_of_discounts * num_items_required
+    return subtotals
+
+
+def checkout_many(skus_list, price_book=None):
+    """
+    Price every basket in skus_list, returning an int64 array of totals in the same order with -1 for invalid baskets
+    """
+    book = price_book or checkout_solution.get_price_book()
+    _, unit_prices = _compile(book)
+    counts, valid = build_count_matrix(skus_list, book)
+
+    run_free_offers(counts, book)
+    totals = run_group_offers(counts, book)
+    totals += run_x_for_y_offers(counts, book)
+    totals += unit_prices @ counts
+
+    totals[~valid] = -1
+    return totals
@@ -0,0 +1,70 @@
+"""
+Memoisation layer in front of checkout().
+
+Baskets are keyed on their count vector, so 'ABC' and 'CBA' share an entry. Counting still happens on every call, but
+a hit skips the whole offer pipeline. The cache empties itself whenever checkout_solution's price book is replaced.
+"""
+from collections import OrderedDict
+
+from . import checkout_solution
+
+DEFAULT_MAX_SIZE = 4096
+
+
+class CheckoutCache:
+    """
+    Bounded LRU cache of basket totals. Not thread safe - use one per thread.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, mode=checkout_solution.GREEDY):
+        if max_size < 1:
+            raise ValueError('max_size must be at least 1')
+        if mode not in (checkout_solution.GREEDY, checkout_solution.OPTIMAL):
+            raise ValueError('Unknown checkout mode {!r}'.format(mode))
+        self.max_size = max_size
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._book = None
+        self._price = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def checkout(self, skus):
+        book = checkout_solution.get_price_book()
+        if book is not self._book:
+            self._bind(book)
+
+        try:
+            counts = book.count(skus)
+        except ValueError:
+            return -1
+
+        key = tuple(counts)
+        total = self._entries.get(key)
+        if total is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return total
+
+        self.misses += 1
+        total = self._price(counts)
+        self._entries[key] = total
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return total
+
+    # ~~~~ Helpers
+
+    def _bind(self, book):
+        self.clear()
+        self._book = book
+        if self.mode == checkout_solution.OPTIMAL:
+            self._price = book.optimal_pricer().price
+        else:
+            self._price = book.price
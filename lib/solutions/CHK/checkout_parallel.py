@@ -0,0 +1,87 @@
+"""
+Price large numbers of baskets across a pool of worker processes.
+
+The compiled price book is pickled to each worker once, when the worker starts, and baskets travel in large batches
+so the IPC cost is spread over many baskets. Only a bounded number of batches are in flight at a time, so arbitrarily
+long inputs can be streamed through. Totals come back in input order.
+
+Command line usage, one basket per line in and one total per line out:
+
+    PYTHONPATH=lib python -m solutions.CHK.checkout_parallel baskets.txt --workers 8 > totals.txt
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from . import checkout_solution
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Batches submitted per worker before waiting on the oldest one
+BATCHES_IN_FLIGHT_PER_WORKER = 2
+
+# The price book for this worker process, set once by the pool initializer
+_worker_book = None
+
+
+def _init_worker(book):
+    global _worker_book
+    _worker_book = book
+
+
+def _price_batch(batch):
+    checkout = _worker_book.checkout
+    return [checkout(skus) for skus in batch]
+
+
+def _batches(baskets, batch_size):
+    baskets = iter(baskets)
+    while batch := list(islice(baskets, batch_size)):
+        yield batch
+
+
+def iter_checkout_parallel(baskets, workers=None, batch_size=DEFAULT_BATCH_SIZE, price_book=None):
+    """
+    Yield the total for each basket in order, pricing them on a pool of worker processes
+    """
+    book = price_book or checkout_solution.get_price_book()
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(book,)) as pool:
+        in_flight = deque()
+        for batch in _batches(baskets, batch_size):
+            in_flight.append(pool.submit(_price_batch, batch))
+            if len(in_flight) >= workers * BATCHES_IN_FLIGHT_PER_WORKER:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def checkout_parallel(baskets, workers=None, batch_size=DEFAULT_BATCH_SIZE, price_book=None):
+    """
+    Return a list with the total for each basket in order, pricing them on a pool of worker processes
+    """
+    return list(iter_checkout_parallel(baskets, workers, batch_size, price_book))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Price baskets, one per line, across multiple processes')
+    parser.add_argument('input', nargs='?', help='file of baskets, one per line (default: stdin)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='baskets sent to a worker at once')
+    args = parser.parse_args(argv)
+
+    source = open(args.input, 'rt') if args.input else sys.stdin
+    try:
+        baskets = (line.rstrip('\n') for line in source)
+        for total in iter_checkout_parallel(baskets, args.workers, args.batch_size):
+            sys.stdout.write('{}\n'.format(total))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
 from collections import defaultdict
 
+from .optimal import DEFAULT_MAX_QUANTITY
+from .price_book import PriceBook, order_free_offers
 
+
+# The built-in price tables. price_book.json holds the same tables in the file format read by price_book_file, for
+# changing prices without a redeploy.
 prices = {
     'A': 50,
     'B': 30,
@@ -42,7 +47,8 @@ special_offers = {
 }
 
 group_discount_offers = {
-    # Match any combination of the skus in the key such that X of them gives Y price, value being (X, Y)
+    # Match any combination of the skus in the key such that X of them gives Y price, value being (X, Y).
+    # Items are used most expensive first, ties in the order listed.
     ('Z', 'S', 'T', 'Y', 'X'): (3, 45)
 }
 
@@ -59,37 +65,36 @@ buy_x_get_y_free_offers = {
 # skus = unicode string
 
 def build_counts_by_sku(skus: str):
-    if not type(skus) == str:
-        raise ValueError
-
-    counts_per_sku = defaultdict(int)
-    for sku in skus:
-        if sku in prices:
-            counts_per_sku[sku] += 1
-        else:
-            raise ValueError
-    return counts_per_sku
+    # Validation and counting happen in the compiled price book, which does both in C level passes over the basket
+    counts = _table_price_book.count(skus)
+    return defaultdict(int, {sku: counts[slot] for sku, slot in _table_price_book.slot_by_sku.items() if counts[slot]})
 
 
 def run_buy_x_get_y_free_offers(counts_per_sku: dict) -> dict:
     """
     Run all buy x get y free offers, removing the free items from the count
-    for that item.
+    for that item. Offers giving an item away run before offers triggered by it.
 
     Note - mutates the input counts
     """
-    for item, offer in buy_x_get_y_free_offers.items():
-        count = counts_per_sku[item]
+    for item in _free_offer_order:
+        count = counts_per_sku.get(item)
+        if not count:
+            continue
+        offer = buy_x_get_y_free_offers[item]
         free_sku = offer[0]
         num_required = offer[1]
         num_given_free_per_occurence = offer[2]
         if (free_sku == item):
             # Special case for the sku giving itself for free
-            # offer applies in groups of (amount_to_trigger + amount_to_remove)
-            # TODO - does this work for Y > 1?
-            num_required = num_required + num_given_free_per_occurence
-        num_occurrences = count // num_required
-        num_free = num_given_free_per_occurence * num_occurrences
+            # offer applies in groups of (amount_to_trigger + amount_to_remove), and a final partial group
+            # gets whatever it has beyond amount_to_trigger for free
+            group_size = num_required + num_given_free_per_occurence
+            num_occurrences, leftover = divmod(count, group_size)
+            num_free = num_given_free_per_occurence * num_occurrences + max(0, leftover - num_required)
+        else:
+            num_occurrences = count // num_required
+            num_free = num_given_free_per_occurence * num_occurrences
         # Even if the offer fires, can't give more for free than are actually in the basket
         counts_per_sku[free_sku] = max(
             0,
@@ -108,6 +113,7 @@ def run_group_offers(counts_by_sku) -> int:
     for sku_list, offer_terms in group_discount_offers.items():
         amount_required = offer_terms[0]
         price = offer_terms[1]
+        sku_list = sorted(sku_list, key=lambda sku: -prices[sku])
         total_count = sum(counts_by_sku[sku] for sku in sku_list)
         total_offers = total_count // amount_required
         total_items_to_remove = total_offers * amount_required
@@ -149,8 +155,83 @@ def total_for_items(counts_per_sku):
     return total
 
 
-def checkout(skus):
-    # String will have a letter for each occurrence of the item
+BUILTIN_VERSION = 'builtin'
+
+# The tables above compiled, used by the reference pipeline
+_table_price_book = PriceBook(
+    prices, special_offers, group_discount_offers, buy_x_get_y_free_offers, version=BUILTIN_VERSION,
+)
+# Order run_buy_x_get_y_free_offers applies the free item offers in
+_free_offer_order = order_free_offers(buy_x_get_y_free_offers)
+# The price book checkout() prices against. Replaced wholesale, never modified, so readers need no lock.
+_price_book = _table_price_book
+
+
+def get_price_book():
+    return _price_book
+
+
+def install_price_book(price_book):
+    """
+    Make checkout() price against price_book from the next call on. Calls already running finish on the book they
+    started with.
+    """
+    global _price_book
+    _price_book = price_book
+
+
+def reload_price_book():
+    """
+    Recompile the price book from the tables above and install it. Needed after editing them at runtime, as
+    checkout() only ever reads the compiled form.
+    """
+    global _table_price_book, _free_offer_order
+    _table_price_book = PriceBook(
+        prices, special_offers, group_discount_offers, buy_x_get_y_free_offers, version=BUILTIN_VERSION,
+    )
+    _free_offer_order = order_free_offers(buy_x_get_y_free_offers)
+    install_price_book(_table_price_book)
+    return _table_price_book
+
+
+def build_count_vector(skus):
+    """
+    Return the basket as a count vector - an array with one slot per SKU, A to Z. Raises ValueError for non-string
+    input or any unrecognised SKU.
+    """
+    return _table_price_book.count(skus)
+
+
+def run_buy_x_get_y_free_offers_in_place(counts):
+    """
+    As run_buy_x_get_y_free_offers, for a count vector or a memoryview of one. Mutates the counts passed in.
+    """
+    _table_price_book.apply_free_offers(counts)
+
+
+def run_group_offers_in_place(counts):
+    """
+    As run_group_offers, for a count vector or a memoryview of one. Mutates the counts passed in.
+    """
+    return _table_price_book.apply_group_offers(counts)
+
+
+def run_x_for_y_offers_in_place(counts):
+    """
+    As run_x_for_y_offers, for a count vector or a memoryview of one. Mutates the counts passed in.
+    """
+    return _table_price_book.apply_x_for_y_offers(counts)
+
+
+def total_for_count_vector(counts):
+    return _table_price_book.total_for_items(counts)
+
+
+def reference_checkout(skus):
+    """
+    Price a basket by walking the tables above directly. This is the readable specification the compiled price book
+    is checked against.
+    """
     try:
         counts_per_sku = build_counts_by_sku(skus)
     except ValueError:
@@ -162,3 +243,40 @@ def checkout(skus):
     total += total_for_items(counts_per_sku)
 
     return total
+
+
+GREEDY = 'greedy'
+OPTIMAL = 'optimal'
+
+# An instrumentation.Instrumentation recording every greedy checkout, or None
+_instrumentation = None
+
+
+def set_instrumentation(instrumentation):
+    """
+    Install an instrumentation.Instrumentation to record stage timings and offer hits, or None to stop recording
+    """
+    global _instrumentation
+    _instrumentation = instrumentation
+
+
+def checkout(skus, mode=GREEDY, explain=False, max_quantity=DEFAULT_MAX_QUANTITY):
+    """
+    mode is GREEDY to apply offers largest bundle first in a fixed order, or OPTIMAL to find the minimum total.
+    max_quantity sizes the per-SKU cost tables of OPTIMAL pricing, see optimal.OptimalPricer.
+
+    With explain=True a greedy checkout returns a receipt.Receipt listing the offers applied and what each saved,
+    rather than just the total.
+    """
+    # String will have a letter for each occurrence of the item
+    if explain:
+        if mode != GREEDY:
+            raise ValueError('Receipts are only available for {!r} checkout'.format(GREEDY))
+        return _price_book.explain(skus)
+    if mode == GREEDY:
+        if _instrumentation is None:
+            return _price_book.checkout(skus)
+        return _instrumentation.checkout(_price_book, skus)
+    if mode == OPTIMAL:
+        return _price_book.optimal_pricer(max_quantity).checkout(skus)
+    raise ValueError('Unknown checkout mode {!r}'.format(mode))
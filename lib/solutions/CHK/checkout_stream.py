@@ -0,0 +1,47 @@
+"""
+Checkout for baskets too large to hold as one string.
+
+Chunks are counted as they arrive into a single count vector, so memory stays constant whatever the basket size. The
+offer pipeline then runs once on the final counts.
+"""
+from functools import partial
+
+from . import checkout_solution
+from .price_book import new_counts
+
+# Files are read in blocks of this many bytes
+BLOCK_SIZE = 1 << 20
+
+
+def checkout_stream(chunks, price_book=None):
+    """
+    Price a basket supplied as an iterable of str or bytes chunks. Returns -1 as soon as an invalid chunk is seen,
+    without consuming the rest of the iterable.
+    """
+    book = price_book or checkout_solution.get_price_book()
+    counts = new_counts()
+    for chunk in chunks:
+        if type(chunk) == str:
+            if not chunk.isascii():
+                return -1
+            chunk = chunk.encode('ascii')
+        elif not isinstance(chunk, (bytes, bytearray)):
+            return -1
+
+        try:
+            chunk_counts = book.count_bytes(chunk)
+        except ValueError:
+            return -1
+        for slot, count in enumerate(chunk_counts):
+            if count:
+                counts[slot] += count
+
+    return book.price(counts)
+
+
+def checkout_file(path, price_book=None, block_size=BLOCK_SIZE):
+    """
+    Price a basket stored in a file, one byte per item, reading it in fixed size blocks
+    """
+    with open(path, 'rb') as f:
+        return checkout_stream(iter(partial(f.read, block_size), b''), price_book)
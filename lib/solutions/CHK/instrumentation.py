@@ -0,0 +1,125 @@
+"""
+Optional per-stage timing and offer telemetry for checkout().
+
+Install an Instrumentation with checkout_solution.set_instrumentation() and every greedy checkout is priced through
+Instrumentation.checkout(), which records the wall time of each stage, the basket size, and for each offer how many
+times it fired (items freed, for buy x get y free offers) and what it saved. Values are aggregated into power-of-two
+histograms, so recording is a few integer operations and memory does not grow with traffic. With no instrumentation
+installed checkout() pays a single None check.
+"""
+import time
+from collections import Counter
+
+COUNT = 'count'
+FREE_OFFERS = 'free_offers'
+GROUP_OFFERS = 'group_offers'
+X_FOR_Y_OFFERS = 'x_for_y_offers'
+TOTAL_FOR_ITEMS = 'total_for_items'
+
+STAGES = (COUNT, FREE_OFFERS, GROUP_OFFERS, X_FOR_Y_OFFERS, TOTAL_FOR_ITEMS)
+
+
+class Histogram:
+    """
+    Counts of non-negative integers in power-of-two buckets: bucket i holds values v with v.bit_length() == i
+    """
+
+    __slots__ = ('count', 'total', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.buckets = [0] * 65
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        self.buckets[min(value.bit_length(), 64)] += 1
+
+    def percentile(self, fraction):
+        """
+        Return an upper bound for the given percentile (0 < fraction <= 1), accurate to a factor of two
+        """
+        if not self.count:
+            return 0
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= wanted:
+                return (1 << bucket) - 1
+        return (1 << 64) - 1
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total': self.total,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'buckets': {1 << bucket: count for bucket, count in enumerate(self.buckets) if count},
+        }
+
+
+class Instrumentation:
+    """
+    callbacks are called with (stage, elapsed nanoseconds) after every stage, for exporting to an external system
+    """
+
+    def __init__(self, callbacks=()):
+        self.stage_times = {stage: Histogram() for stage in STAGES}
+        self.basket_sizes = Histogram()
+        self.offer_hits = Counter()
+        self.offer_savings = Counter()
+        self._callbacks = tuple(callbacks)
+
+    def record_stage(self, stage, elapsed_ns):
+        self.stage_times[stage].record(elapsed_ns)
+        for callback in self._callbacks:
+            callback(stage, elapsed_ns)
+
+    def record_offer(self, offer_id, quantity, saving):
+        self.offer_hits[offer_id] += quantity
+        self.offer_savings[offer_id] += saving
+
+    def checkout(self, book, skus):
+        """
+        Price a basket with the given price book, recording each stage
+        """
+        clock = time.perf_counter_ns
+        start = clock()
+        try:
+            counts = book.count(skus)
+        except ValueError:
+            self.record_stage(COUNT, clock() - start)
+            return -1
+        end = clock()
+        self.record_stage(COUNT, end - start)
+        self.basket_sizes.record(sum(counts))
+
+        start = end
+        book.apply_free_offers(counts, self.record_offer)
+        end = clock()
+        self.record_stage(FREE_OFFERS, end - start)
+
+        start = end
+        total = book.apply_group_offers(counts, self.record_offer)
+        end = clock()
+        self.record_stage(GROUP_OFFERS, end - start)
+
+        start = end
+        total += book.apply_x_for_y_offers(counts, self.record_offer)
+        end = clock()
+        self.record_stage(X_FOR_Y_OFFERS, end - start)
+
+        start = end
+        total += book.total_for_items(counts)
+        self.record_stage(TOTAL_FOR_ITEMS, clock() - start)
+        return total
+
+    def snapshot(self):
+        return {
+            'stage_times_ns': {stage: histogram.as_dict() for stage, histogram in self.stage_times.items()},
+            'basket_sizes': self.basket_sizes.as_dict(),
+            'offer_hits': dict(self.offer_hits),
+            'offer_savings': dict(self.offer_savings),
+        }
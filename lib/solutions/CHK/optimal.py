@@ -0,0 +1,212 @@
+"""
+Minimum-total pricing, as an alternative to the greedy offer pipeline.
+
+Greedy pricing applies the largest X-for-Y bundle first and drains group members in a fixed order. That is optimal
+for the current tables but not for every price book. OptimalPricer finds the true minimum for the group and X-for-Y
+stages:
+
+- Each SKU gets a table of its cheapest cost for 0..N items using its X-for-Y ladder (an unbounded knapsack). The
+  table is long enough that beyond it the cheapest price per item bundle is always part of an optimal answer, so
+  larger counts are priced by repeating that bundle down into the table.
+- Group offers that share members compete for the same items, so each connected set of them is priced as one unit.
+  A bundle of k items at price p costs p / k per item, so the cost of a set splits into a cost per SKU: its items
+  handed to each group at that group's item cost, plus its ladder cost for the rest. The only thing tying the SKUs
+  together is that each group must get a whole number of bundles, so a DP over the SKUs keeps, for each combination
+  of the groups' item counts modulo their bundle sizes, the cheapest cost so far.
+
+For one SKU only its cheapest group ever needs more than a bundle size's worth of items from it, and past its table the
+ladder cost repeats, so only a bounded number of ways to split its items need trying whatever its count. The work per
+basket therefore depends on the price book, not on the basket size.
+
+Buy X get Y free offers are applied exactly as in greedy pricing before anything else.
+"""
+from functools import lru_cache
+from itertools import product
+from math import lcm
+
+# Default minimum length of each per-SKU cost table
+DEFAULT_MAX_QUANTITY = 1000
+
+# Member count combinations remembered per pricer for each set of group offers
+GROUP_COST_CACHE_SIZE = 4096
+
+
+class OptimalPricer:
+
+    def __init__(self, book, max_quantity=DEFAULT_MAX_QUANTITY):
+        self._book = book
+        self.max_quantity = max_quantity
+
+        self._best_bundles = []
+        self._periodic_from = []
+        self._cost_tables = []
+        for slot, unit_price in enumerate(book.unit_prices):
+            bundles = ((1, unit_price),) + book.ladders[slot]
+            best_bundle = min(bundles, key=lambda bundle: (bundle[1] / bundle[0], bundle[0]))
+            # Past best bundle size * largest bundle size items, an optimal answer always uses the best bundle
+            periodic_from = best_bundle[0] * max(size for size, _ in bundles)
+            self._best_bundles.append(best_bundle)
+            self._periodic_from.append(periodic_from)
+            self._cost_tables.append(_cost_table(bundles, max(max_quantity, periodic_from) + 1))
+
+        # Group offers split into connected sets sharing members, each priced by _compute_group_cost
+        self._group_components = tuple(
+            _GroupComponent(book, groups) for groups in _connected_groups(book.group_offers)
+        )
+        self._group_cost = lru_cache(maxsize=GROUP_COST_CACHE_SIZE)(self._compute_group_cost)
+
+    def line_cost(self, slot, count):
+        """
+        Return the cheapest cost of count items of one SKU using only its X-for-Y ladder
+        """
+        table = self._cost_tables[slot]
+        if count < len(table):
+            return table[count]
+        size, price = self._best_bundles[slot]
+        repeats = (count - len(table)) // size + 1
+        return repeats * price + table[count - repeats * size]
+
+    def price(self, counts):
+        """
+        Return the minimum total for a count vector, leaving the vector passed in untouched
+        """
+        counts = list(counts)
+        self._book.apply_free_offers(counts)
+        total = 0
+        for component, group_component in enumerate(self._group_components):
+            member_counts = tuple(counts[slot] for slot in group_component.slots)
+            if any(member_counts):
+                total += self._group_cost(component, member_counts)
+                for slot in group_component.slots:
+                    counts[slot] = 0
+        line_cost = self.line_cost
+        return total + sum(line_cost(slot, count) for slot, count in enumerate(counts) if count)
+
+    def checkout(self, skus):
+        try:
+            counts = self._book.count(skus)
+        except ValueError:
+            return -1
+        return self.price(counts)
+
+    # ~~~~ Helpers
+
+    def _compute_group_cost(self, component, member_counts):
+        """
+        Return the cheapest cost of every item of a set of group offers' members, using the groups and the members'
+        own ladders
+        """
+        group_component = self._group_components[component]
+        moduli = group_component.moduli
+        costs = {(0,) * len(moduli): 0}
+        for member, count in enumerate(member_counts):
+            if not count:
+                continue
+            options = self._member_options(group_component, member, count)
+            next_costs = {}
+            for residues, cost in costs.items():
+                for handed, member_cost in options.items():
+                    key = tuple((residue + taken) % modulus
+                                for residue, taken, modulus in zip(residues, handed, moduli))
+                    value = cost + member_cost
+                    if value < next_costs.get(key, value + 1):
+                        next_costs[key] = value
+            costs = next_costs
+        return costs[(0,) * len(moduli)] // group_component.scale
+
+    def _member_options(self, group_component, member, count):
+        """
+        Return {residues handed to each group: cheapest scaled cost} for count items of one member. Items handed to a
+        group cost its scaled item cost, the rest are priced on the member's ladder.
+
+        Handing bundle size * cheapest bundle size items to another group instead of the member's cheapest group never
+        saves anything, so other groups get fewer than that. Past the ladder's table the cost of the rest repeats every
+        lcm(best ladder bundle, cheapest bundle size) items, so the cheapest group's cost changes at a constant rate
+        along that step: only the first and last steps, and what falls inside the table, need trying.
+        """
+        slot = group_component.slots[member]
+        cheapest = group_component.cheapest_group[member]
+        others = group_component.other_groups[member]
+        moduli = group_component.moduli
+        item_costs = group_component.item_costs
+        scale = group_component.scale
+        line_cost = self.line_cost
+        step = lcm(self._best_bundles[slot][0], moduli[cheapest])
+        periodic_from = self._periodic_from[slot]
+
+        options = {}
+        handed = [0] * len(moduli)
+        for other_takes in product(*(range(moduli[group] * moduli[cheapest]) for group in others)):
+            rest = count - sum(other_takes)
+            if rest < 0:
+                continue
+            base = 0
+            for group, taken in zip(others, other_takes):
+                handed[group] = taken % moduli[group]
+                base += taken * item_costs[group]
+            if rest < 2 * step + periodic_from:
+                takes = range(rest + 1)
+            else:
+                takes = (*range(step), *range(rest - periodic_from - step + 1, rest + 1))
+            for taken in takes:
+                handed[cheapest] = taken % moduli[cheapest]
+                cost = base + taken * item_costs[cheapest] + scale * line_cost(slot, rest - taken)
+                key = tuple(handed)
+                if cost < options.get(key, cost + 1):
+                    options[key] = cost
+        return options
+
+
+class _GroupComponent:
+    """
+    A connected set of group offers, precomputed for pricing. Costs are scaled by the lcm of the bundle sizes, so each
+    group's cost per item is a whole number.
+    """
+
+    def __init__(self, book, groups):
+        group_offers = [book.group_offers[index] for index in groups]
+        self.slots = tuple(sorted({slot for members, _, _ in group_offers for slot in members}))
+        self.moduli = tuple(amount_required for _, amount_required, _ in group_offers)
+        self.scale = lcm(*self.moduli)
+        self.item_costs = tuple(price * self.scale // amount_required for _, amount_required, price in group_offers)
+
+        # Per member, the group with the lowest cost per item, ties in book order, and the other groups it is in
+        self.cheapest_group = []
+        self.other_groups = []
+        for slot in self.slots:
+            containing = [position for position, (members, _, _) in enumerate(group_offers) if slot in members]
+            cheapest = min(containing, key=lambda position: self.item_costs[position])
+            self.cheapest_group.append(cheapest)
+            self.other_groups.append(tuple(position for position in containing if position != cheapest))
+
+
+def _connected_groups(group_offers):
+    """
+    Return the indices of the group offers split into sets that share members, directly or through other groups, each
+    in book order and the sets ordered by their first group
+    """
+    components = []
+    for index, (members, _, _) in enumerate(group_offers):
+        members = set(members)
+        joined = [component for component in components if component[1] & members]
+        groups = [index]
+        for component in joined:
+            components.remove(component)
+            groups.extend(component[0])
+            members |= component[1]
+        components.append((sorted(groups), members))
+    return sorted(tuple(groups) for groups, _ in components)
+
+
+def _cost_table(bundles, length):
+    """
+    Return the cheapest cost of 0..length-1 items made up of any number of the (number of items, price) bundles
+    """
+    table = [0] * length
+    for count in range(1, length):
+        table[count] = min(
+            table[count - size] + price
+            for size, price in bundles
+            if size <= count
+        )
+    return table
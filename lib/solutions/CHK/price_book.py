@@ -0,0 +1,303 @@
+"""
+Compiled form of the checkout price tables.
+
+The tables in checkout_solution are keyed by SKU and easy to read and edit, but walking them on every call costs a dict
+lookup and a tuple unpack per SKU per offer. A PriceBook compiles them once into flat tuples addressed by an integer
+slot per SKU, so pricing a basket becomes integer arithmetic over a count vector.
+
+SKUs are the letters A-Z and each has a fixed slot, its position in the alphabet. A count vector is an array('q') of
+NUM_SLOTS counts (see new_counts), and every stage works in place on one, or on a memoryview of one, without
+allocating. Slots for SKUs a book does not sell always hold zero.
+
+A PriceBook is treated as immutable once built, so one can be swapped in for another with a plain reference
+assignment while other threads are pricing against it.
+"""
+from array import array
+from operator import mul
+from types import MappingProxyType
+
+from .optimal import DEFAULT_MAX_QUANTITY, OptimalPricer
+from .receipt import Receipt
+
+SLOT_SKUS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+NUM_SLOTS = len(SLOT_SKUS)
+
+# Typecode for count vectors - a signed 64 bit integer on every platform, unlike 'l'
+COUNT_TYPECODE = 'q'
+
+_EMPTY_COUNTS = array(COUNT_TYPECODE, [0] * NUM_SLOTS)
+
+
+def new_counts():
+    """
+    Return a zeroed count vector
+    """
+    return array(COUNT_TYPECODE, _EMPTY_COUNTS)
+
+
+# Baskets shorter than this are counted byte by byte, longer ones with C level bytes.translate and bytes.count passes
+SHORT_BASKET_LENGTH = 32
+
+
+class PriceBook:
+
+    def __init__(self, prices, special_offers, group_discount_offers, buy_x_get_y_free_offers, version=None):
+        # Identifies where this book came from, e.g. a hash of the file it was loaded from
+        self.version = version
+        # The SKUs this book sells
+        self.skus = tuple(sorted(prices))
+        for sku in self.skus:
+            if len(sku) != 1 or sku not in SLOT_SKUS:
+                raise ValueError('SKUs must be single letters A-Z, got {!r}'.format(sku))
+        self.slot_by_sku = MappingProxyType({sku: SLOT_SKUS.index(sku) for sku in self.skus})
+        self.unit_prices = tuple(prices.get(sku, 0) for sku in SLOT_SKUS)
+        self._sku_bytes = ''.join(self.skus).encode('ascii')
+        self._slot_by_byte = [-1] * 256
+        for sku, slot in self.slot_by_sku.items():
+            self._slot_by_byte[ord(sku)] = slot
+
+        # Per slot, the (number of items, discounted price) bundles with the largest bundle first. Bundles of the same
+        # size keep their listed order, as they do in reference_checkout.
+        self.ladders = tuple(
+            tuple(sorted(special_offers.get(sku, ()), key=lambda offer: -offer[0]))
+            for sku in SLOT_SKUS
+        )
+        self.ladder_slots = tuple(slot for slot, ladder in enumerate(self.ladders) if ladder)
+        self.ladder_offer_ids = tuple(
+            tuple('ladder:{}:{}'.format(sku, num_items_required) for num_items_required, _ in ladder)
+            for sku, ladder in zip(SLOT_SKUS, self.ladders)
+        )
+
+        # Each entry is (member slots in the order they are consumed, number of items required, price). Members are
+        # consumed most expensive first, ties in the order listed, which leaves the customer the cheapest items to
+        # pay for. Overlapping groups are applied in the order listed, each taking from what earlier ones left.
+        group_offers = []
+        for sku_list, (amount_required, price) in group_discount_offers.items():
+            members = sorted(
+                (self.slot_by_sku[sku] for sku in sku_list),
+                key=lambda slot: -self.unit_prices[slot],
+            )
+            group_offers.append((tuple(members), amount_required, price))
+        self.group_offers = tuple(group_offers)
+        self.group_offer_ids = tuple('group:{}'.format(''.join(sku_list)) for sku_list in group_discount_offers)
+
+        # Each entry is (trigger slot, free slot, items per occurrence, number given free per occurrence, number paid
+        # for per occurrence), in dependency order. A sku giving itself for free applies in groups of (amount to
+        # trigger + amount given free), and a final partial group gets whatever it has beyond the amount to trigger.
+        # Otherwise an occurrence is just the amount to trigger.
+        free_offers = []
+        free_offer_ids = []
+        for item in order_free_offers(buy_x_get_y_free_offers):
+            free_sku, num_required, num_free = buy_x_get_y_free_offers[item]
+            period = num_required + num_free if free_sku == item else num_required
+            free_offers.append((self.slot_by_sku[item], self.slot_by_sku[free_sku], period, num_free, num_required))
+            free_offer_ids.append('free:{}'.format(item))
+        self.free_offers = tuple(free_offers)
+        self.free_offer_ids = tuple(free_offer_ids)
+
+        # Built on first use, as most callers only ever need greedy pricing. Keyed by max_quantity.
+        self._optimal_pricers = {}
+
+    def __getstate__(self):
+        # Optimal pricers hold caches that are cheap to rebuild, so they are left out when shipping a book elsewhere
+        state = self.__dict__.copy()
+        state['_optimal_pricers'] = {}
+        state['slot_by_sku'] = dict(self.slot_by_sku)
+        return state
+
+    def __setstate__(self, state):
+        state['slot_by_sku'] = MappingProxyType(state['slot_by_sku'])
+        self.__dict__.update(state)
+
+    def free_items_given(self, index, trigger_count):
+        """
+        Return how many items free item offer index gives away for the given count of its trigger
+        """
+        _, _, period, num_free, num_paid = self.free_offers[index]
+        num_occurrences, leftover = divmod(trigger_count, period)
+        return num_occurrences * num_free + (leftover - num_paid if leftover > num_paid else 0)
+
+    def count(self, skus):
+        """
+        Return a new count vector for a basket string.
+
+        Raises ValueError for non-string input or any unrecognised SKU.
+        """
+        if not type(skus) == str or not skus.isascii():
+            raise ValueError
+        return self.count_bytes(skus.encode('ascii'))
+
+    def count_bytes(self, data):
+        """
+        Return a new count vector for an ASCII encoded basket, raising ValueError if it contains any unrecognised
+        SKU.
+
+        Short baskets are counted with a per-byte table lookup. Longer ones are validated by deleting every known SKU
+        with bytes.translate and counted with one bytes.count per SKU, which keeps the per-item work in C.
+        """
+        counts = array(COUNT_TYPECODE, _EMPTY_COUNTS)
+        if len(data) < SHORT_BASKET_LENGTH:
+            slot_by_byte = self._slot_by_byte
+            for byte in data:
+                slot = slot_by_byte[byte]
+                if slot < 0:
+                    raise ValueError
+                counts[slot] += 1
+            return counts
+
+        if data.translate(None, self._sku_bytes):
+            raise ValueError
+        slot_by_byte = self._slot_by_byte
+        for byte in self._sku_bytes:
+            counts[slot_by_byte[byte]] = data.count(byte)
+        return counts
+
+    def apply_free_offers(self, counts, on_offer=None):
+        """
+        Run all buy x get y free offers, removing the free items from the count for that item.
+
+        on_offer, if given, is called with (offer id, items freed, saving) for every offer that frees at least one item.
+
+        Note - mutates the input counts
+        """
+        for index, (trigger, free, period, num_free, num_paid) in enumerate(self.free_offers):
+            trigger_count = counts[trigger]
+            if not trigger_count:
+                continue
+            num_occurrences, leftover = divmod(trigger_count, period)
+            num_given = num_occurrences * num_free
+            if leftover > num_paid:
+                num_given += leftover - num_paid
+            if not num_given:
+                continue
+            remaining = counts[free] - num_given
+            if on_offer is not None and counts[free]:
+                freed = num_given if remaining > 0 else counts[free]
+                on_offer(self.free_offer_ids[index], freed, freed * self.unit_prices[free])
+            counts[free] = remaining if remaining > 0 else 0
+
+    def apply_group_offers(self, counts, on_offer=None):
+        """
+        Run all group offers, removing SKUs used from the count. Return the subtotal for all offers applied.
+
+        on_offer, if given, is called with (offer id, times applied, saving) for every offer that fires.
+
+        Note - mutates the input counts
+        """
+        subtotal = 0
+        for index, (members, amount_required, price) in enumerate(self.group_offers):
+            total_count = 0
+            for slot in members:
+                total_count += counts[slot]
+            total_offers = total_count // amount_required
+            if not total_offers:
+                continue
+            if on_offer is not None:
+                list_price = self.total_for_items(counts)
+            to_remove = total_offers * amount_required
+            for slot in members:
+                taken = counts[slot] if counts[slot] < to_remove else to_remove
+                counts[slot] -= taken
+                to_remove -= taken
+            subtotal += price * total_offers
+            if on_offer is not None:
+                list_price -= self.total_for_items(counts)
+                on_offer(self.group_offer_ids[index], total_offers, list_price - price * total_offers)
+        return subtotal
+
+    def apply_x_for_y_offers(self, counts, on_offer=None):
+        """
+        Run all 'X skus for Y price' offers. Return the subtotal for all offers applied.
+
+        on_offer, if given, is called with (offer id, times applied, saving) for every offer that fires.
+
+        Note - mutates the input counts
+        """
+        subtotal = 0
+        ladders = self.ladders
+        for slot in self.ladder_slots:
+            remaining = counts[slot]
+            for index, (num_items_required, discounted_price) in enumerate(ladders[slot]):
+                if remaining < num_items_required:
+                    continue
+                num_of_discounts = remaining // num_items_required
+                subtotal += num_of_discounts * discounted_price
+                remaining -= num_of_discounts * num_items_required
+                if on_offer is not None:
+                    saving = num_items_required * self.unit_prices[slot] - discounted_price
+                    on_offer(self.ladder_offer_ids[slot][index], num_of_discounts, saving * num_of_discounts)
+            counts[slot] = remaining
+        return subtotal
+
+    def total_for_items(self, counts):
+        return sum(map(mul, self.unit_prices, counts))
+
+    def price(self, counts):
+        """
+        Return the total for a count vector, leaving the vector passed in untouched
+        """
+        counts = array(COUNT_TYPECODE, counts)
+        self.apply_free_offers(counts)
+        total = self.apply_group_offers(counts)
+        total += self.apply_x_for_y_offers(counts)
+        return total + self.total_for_items(counts)
+
+    def optimal_pricer(self, max_quantity=DEFAULT_MAX_QUANTITY):
+        """
+        Return the OptimalPricer for this book, which finds the minimum total rather than applying offers greedily.
+        max_quantity is the minimum length of its per-SKU cost tables.
+        """
+        pricer = self._optimal_pricers.get(max_quantity)
+        if pricer is None:
+            pricer = self._optimal_pricers[max_quantity] = OptimalPricer(self, max_quantity)
+        return pricer
+
+    def checkout(self, skus):
+        try:
+            counts = self.count(skus)
+        except ValueError:
+            return -1
+
+        self.apply_free_offers(counts)
+        total = self.apply_group_offers(counts)
+        total += self.apply_x_for_y_offers(counts)
+        return total + self.total_for_items(counts)
+
+    def explain(self, skus):
+        """
+        Price a basket as checkout() does, returning a Receipt listing every offer applied and what it saved
+        """
+        try:
+            counts = self.count(skus)
+        except ValueError:
+            return Receipt(-1)
+
+        receipt = Receipt(0)
+        self.apply_free_offers(counts, receipt.add)
+        total = self.apply_group_offers(counts, receipt.add)
+        total += self.apply_x_for_y_offers(counts, receipt.add)
+        receipt.total = total + self.total_for_items(counts)
+        return receipt
+
+
+def order_free_offers(buy_x_get_y_free_offers):
+    """
+    Return the trigger skus of buy x get y free offers in the order the offers should run: an offer that gives away
+    an item runs before any offer triggered by that item, so free items never count towards further offers. Offers
+    otherwise keep their listed order, as do any caught in a cycle.
+    """
+    triggers = list(buy_x_get_y_free_offers)
+    # For each trigger, the other offers whose free item it is, which must run first
+    waiting_on = {
+        item: {other for other in triggers if other != item and buy_x_get_y_free_offers[other][0] == item}
+        for item in triggers
+    }
+    ordered = []
+    while len(ordered) < len(triggers):
+        ready = [item for item in triggers if item not in ordered and not waiting_on[item] - set(ordered)]
+        if not ready:
+            # A cycle - fall back to listed order for everything left
+            ordered.extend(item for item in triggers if item not in ordered)
+            break
+        ordered.append(ready[0])
+    return ordered
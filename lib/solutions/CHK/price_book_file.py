@@ -0,0 +1,186 @@
+"""
+Loading price books from JSON or TOML files, and keeping checkout() in step with such a file.
+
+The file holds the same four tables as checkout_solution:
+
+    {
+        "prices": {"A": 50, "B": 30},
+        "special_offers": {"A": [[5, 200], [3, 130]]},
+        "group_discount_offers": [{"skus": ["A", "B"], "quantity": 3, "price": 45}],
+        "buy_x_get_y_free_offers": {"A": ["B", 2, 1]}
+    }
+
+Everything is validated before a PriceBook is built, and a new book only replaces the installed one once it has been
+built successfully. A file that fails to load leaves the previous version in place.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from . import checkout_solution
+from .price_book import SLOT_SKUS, PriceBook
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+
+
+def load_price_book(path):
+    """
+    Load and validate a price book from a .json or .toml file. Its version is a hash of the file contents.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    if str(path).endswith('.toml'):
+        if tomllib is None:
+            raise ValueError('Loading TOML price books needs Python 3.11+ or the tomli package')
+        data = tomllib.loads(raw.decode('utf-8'))
+    else:
+        data = json.loads(raw)
+
+    return price_book_from_dict(data, version=hashlib.sha256(raw).hexdigest()[:12])
+
+
+def price_book_from_dict(data, version=None):
+    """
+    Build a PriceBook from tables in the file layout, raising ValueError if anything in them is malformed
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Price book must be a mapping of tables')
+
+    prices = data.get('prices')
+    if not isinstance(prices, dict) or not prices:
+        raise ValueError('prices must be a non-empty mapping of sku to price')
+    special_offers_table = _table(data, 'special_offers', dict)
+    group_offers_table = _table(data, 'group_discount_offers', list)
+    free_offers_table = _table(data, 'buy_x_get_y_free_offers', dict)
+    for sku, price in prices.items():
+        _check_sku(sku, 'prices')
+        _check_int(price, 'price of {}'.format(sku), minimum=0)
+
+    special_offers = {}
+    for sku, offers in special_offers_table.items():
+        _check_known(sku, prices, 'special_offers')
+        if not isinstance(offers, list):
+            raise ValueError('special_offers for {} must be a list of offers, got {!r}'.format(sku, offers))
+        special_offers[sku] = []
+        for offer in offers:
+            num_items_required, discounted_price = _unpack(offer, 2, 'special_offers for {}'.format(sku))
+            _check_int(num_items_required, 'special_offers quantity for {}'.format(sku), minimum=1)
+            _check_int(discounted_price, 'special_offers price for {}'.format(sku), minimum=0)
+            special_offers[sku].append((num_items_required, discounted_price))
+
+    group_discount_offers = {}
+    for offer in group_offers_table:
+        if not isinstance(offer, dict):
+            raise ValueError('Each group_discount_offers entry must be a mapping')
+        sku_list = offer.get('skus')
+        if not isinstance(sku_list, list) or not sku_list:
+            raise ValueError('group_discount_offers skus must be a non-empty list of distinct skus')
+        for sku in sku_list:
+            _check_known(sku, prices, 'group_discount_offers')
+        if len(set(sku_list)) != len(sku_list):
+            raise ValueError('group_discount_offers skus must be a non-empty list of distinct skus')
+        _check_int(offer.get('quantity'), 'group_discount_offers quantity', minimum=1)
+        _check_int(offer.get('price'), 'group_discount_offers price', minimum=0)
+        group_discount_offers[tuple(sku_list)] = (offer['quantity'], offer['price'])
+
+    buy_x_get_y_free_offers = {}
+    for sku, offer in free_offers_table.items():
+        _check_known(sku, prices, 'buy_x_get_y_free_offers')
+        free_sku, num_required, num_free = _unpack(offer, 3, 'buy_x_get_y_free_offers for {}'.format(sku))
+        _check_known(free_sku, prices, 'buy_x_get_y_free_offers')
+        _check_int(num_required, 'buy_x_get_y_free_offers quantity for {}'.format(sku), minimum=1)
+        _check_int(num_free, 'buy_x_get_y_free_offers free quantity for {}'.format(sku), minimum=1)
+        buy_x_get_y_free_offers[sku] = (free_sku, num_required, num_free)
+
+    return PriceBook(prices, special_offers, group_discount_offers, buy_x_get_y_free_offers, version=version)
+
+
+class PriceBookFile:
+    """
+    Installs the price book from a file into checkout_solution, and again whenever the file's modification time
+    changes. Call refresh() to check on demand, or start() to check in a background thread.
+    """
+
+    def __init__(self, path, poll_interval=DEFAULT_POLL_INTERVAL_SECONDS):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.last_error = None
+        self._modified = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self):
+        """
+        Load and install the file if it changed since the last successful load. Return True if a new book was
+        installed. Errors propagate and leave the current book installed.
+        """
+        modified = os.stat(self.path).st_mtime_ns
+        if modified == self._modified:
+            return False
+        book = load_price_book(self.path)
+        checkout_solution.install_price_book(book)
+        self._modified = modified
+        return True
+
+    def start(self):
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name='price-book-file', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # ~~~~ Helpers
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+                self.last_error = None
+            except (OSError, ValueError) as e:
+                self.last_error = e
+
+
+def _table(data, name, kind):
+    table = data.get(name, kind())
+    if not isinstance(table, kind):
+        raise ValueError('{} must be a {}, got {!r}'.format(name, 'mapping' if kind is dict else 'list', table))
+    return table
+
+
+def _check_sku(sku, table):
+    # The same rule PriceBook applies, checked here so a bad file gets a message naming the table
+    if not isinstance(sku, str) or len(sku) != 1 or sku not in SLOT_SKUS:
+        raise ValueError('{}: skus must be single letters A-Z, got {!r}'.format(table, sku))
+
+
+def _check_known(sku, prices, table):
+    _check_sku(sku, table)
+    if sku not in prices:
+        raise ValueError('{}: unknown sku {!r}'.format(table, sku))
+
+
+def _check_int(value, name, minimum):
+    if type(value) != int or value < minimum:
+        raise ValueError('{} must be an integer of at least {}, got {!r}'.format(name, minimum, value))
+
+
+def _unpack(value, length, name):
+    if not isinstance(value, (list, tuple)) or len(value) != length:
+        raise ValueError('{} must be a list of {} values, got {!r}'.format(name, length, value))
+    return value
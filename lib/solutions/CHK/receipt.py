@@ -0,0 +1,45 @@
+"""
+Itemised receipts for checkout(skus, explain=True).
+
+A Receipt is filled in by the same single pass that prices the basket: its add method is passed to each PriceBook
+stage as the on_offer callback. Nothing here is touched by the plain checkout path, which passes no callback.
+"""
+
+
+class Receipt:
+    """
+    lines holds one (offer id, quantity, saving) tuple per offer applied, in the order they were applied. The quantity
+    is the number of items given free for a buy x get y free offer, and the number of times the offer was applied for
+    any other. Savings are against the unit prices of the items the offer covered.
+    """
+
+    __slots__ = ('total', 'lines')
+
+    def __init__(self, total, lines=None):
+        self.total = total
+        self.lines = lines if lines is not None else []
+
+    def add(self, offer_id, quantity, saving):
+        self.lines.append((offer_id, quantity, saving))
+
+    @property
+    def saving(self):
+        return sum(line[2] for line in self.lines)
+
+    def __eq__(self, other):
+        if isinstance(other, Receipt):
+            return self.total == other.total and self.lines == other.lines
+        return NotImplemented
+
+    def __repr__(self):
+        return 'Receipt({!r}, {!r})'.format(self.total, self.lines)
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'saving': self.saving,
+            'lines': [
+                {'offer_id': offer_id, 'quantity': quantity, 'saving': saving}
+                for offer_id, quantity, saving in self.lines
+            ],
+        }
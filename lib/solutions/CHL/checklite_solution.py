@@ -1,6 +1,64 @@
+"""
+Checkout for the first round's smaller catalogue: SKUs A to D, with 3A for 130 and 2B for 45.
+
+Pricing runs on a PriceBook from the checkout engine, using checkout's unit prices, so the two always agree on the
+rules they share. Baskets of up to SHORT_BASKET_LENGTH items, the common case, are priced by one lookup in a table of
+totals indexed by the count of each SKU.
+"""
+import itertools
+
+from solutions.CHK import checkout_solution
+from solutions.CHK.price_book import PriceBook, new_counts
+
+SKUS = 'ABCD'
+
+special_offers = {
+    # Each tuple is (number of items, discounted price)
+    'A': [(3, 130)],
+    'B': [(2, 45)],
+}
+
+price_book = PriceBook({sku: checkout_solution.prices[sku] for sku in SKUS}, special_offers, {}, {})
+
+# Baskets up to this many items are priced from SHORT_BASKET_TOTALS
+SHORT_BASKET_LENGTH = 8
+_RADIX = SHORT_BASKET_LENGTH + 1
+
+
+def _short_basket_totals():
+    """
+    Totals for every combination of 0 to SHORT_BASKET_LENGTH of each SKU, indexed by the counts read as base _RADIX
+    digits in SKUS order
+    """
+    # No checklite offer spans more than one SKU, so a basket's total is the sum of its per-SKU line totals
+    line_totals = [
+        [price_book.price(_counts_for(sku, count)) for count in range(_RADIX)]
+        for sku in SKUS
+    ]
+    return [sum(totals) for totals in itertools.product(*line_totals)]
+
+
+def _counts_for(sku, count):
+    counts = new_counts()
+    counts[price_book.slot_by_sku[sku]] = count
+    return counts
+
+
+SHORT_BASKET_TOTALS = _short_basket_totals()
 
 
 # noinspection PyUnusedLocal
 # skus = unicode string
 def checklite(skus):
-    raise NotImplementedError()
+    if type(skus) != str:
+        return -1
+    if len(skus) > SHORT_BASKET_LENGTH:
+        return price_book.checkout(skus)
+
+    a = skus.count('A')
+    b = skus.count('B')
+    c = skus.count('C')
+    d = skus.count('D')
+    if a + b + c + d != len(skus):
+        return -1
+    return SHORT_BASKET_TOTALS[((a * _RADIX + b) * _RADIX + c) * _RADIX + d]
@@ -1,3 +1,53 @@
+"""
+FizzBuzz for single numbers and for long runs of consecutive numbers.
+
+The answer only depends on the number modulo 15, so FIZZ_BUZZ_CYCLE holds the word for each position in the cycle, or
+None where the number itself is the answer. A run is filled one cycle position at a time with extended slice
+assignment: each of the 15 positions is either one repeated word or str() mapped over a stepped range, so no
+per-number Python code runs and only the numbers that appear in the output are formatted.
+"""
+from itertools import repeat
+
+FIZZ = 'fizz'
+BUZZ = 'buzz'
+FIZZ_BUZZ = 'fizz buzz'
+
+# Answer for each value of number % 15, None where the answer is the number itself
+FIZZ_BUZZ_CYCLE = tuple(
+    FIZZ_BUZZ if n % 15 == 0 else FIZZ if n % 3 == 0 else BUZZ if n % 5 == 0 else None
+    for n in range(15)
+)
+
+# Numbers per block when streaming a range, a multiple of the cycle length
+BLOCK_SIZE = 15 * 4096
+
+
 # noinspection PyUnusedLocal
 def fizz_buzz(number):
-    raise NotImplementedError()
+    return FIZZ_BUZZ_CYCLE[number % 15] or str(number)
+
+
+def fill_fizz_buzz(out, start):
+    """
+    Write the answers for start, start + 1, ... into the preallocated list out, filling all of it
+    """
+    size = len(out)
+    for offset in range(min(15, size)):
+        word = FIZZ_BUZZ_CYCLE[(start + offset) % 15]
+        if word is None:
+            out[offset::15] = map(str, range(start + offset, start + size, 15))
+        else:
+            out[offset::15] = repeat(word, len(range(offset, size, 15)))
+    return out
+
+
+def fizz_buzz_range(start, stop):
+    """
+    Yield the answers for every number from start up to, but not including, stop. Memory use is bounded by BLOCK_SIZE
+    whatever the length of the range.
+    """
+    block = [None] * BLOCK_SIZE
+    for block_start in range(start, stop, BLOCK_SIZE):
+        if stop - block_start < BLOCK_SIZE:
+            block = [None] * (stop - block_start)
+        yield from fill_fizz_buzz(block, block_start)
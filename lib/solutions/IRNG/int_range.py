@@ -1,3 +1,124 @@
+"""
+Integer ranges that never materialise their elements.
+
+generate() returns an IntRange: a read only sequence backed by a range, so len, indexing, slicing and membership tests
+are O(1) whatever the size. Consumers that need contiguous memory can export it in bulk as an array.array or a NumPy
+array, either whole or one fixed size chunk at a time, and iter_json() writes it out without building a list first.
+"""
+from array import array
+from collections.abc import Sequence
+
+import numpy as np
+
+# Elements per chunk when iterating in chunks
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# array.array typecode of the exported elements, a signed 64 bit int
+ARRAY_TYPECODE = 'q'
+
+
+class IntRange(Sequence):
+
+    __slots__ = ('_range',)
+
+    def __init__(self, start, end, step=1):
+        self._range = range(start, end, step)
+
+    @classmethod
+    def _wrap(cls, values):
+        instance = cls.__new__(cls)
+        instance._range = values
+        return instance
+
+    @property
+    def start(self):
+        return self._range.start
+
+    @property
+    def stop(self):
+        return self._range.stop
+
+    @property
+    def step(self):
+        return self._range.step
+
+    def __len__(self):
+        return len(self._range)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._wrap(self._range[index])
+        return self._range[index]
+
+    def __contains__(self, value):
+        return value in self._range
+
+    def __iter__(self):
+        return iter(self._range)
+
+    def __reversed__(self):
+        return reversed(self._range)
+
+    def index(self, value, *args):
+        return self._range.index(value, *args)
+
+    def count(self, value):
+        return self._range.count(value)
+
+    def __eq__(self, other):
+        if isinstance(other, IntRange):
+            return self._range == other._range
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._range)
+
+    def __repr__(self):
+        return 'IntRange({}, {}{})'.format(
+            self.start, self.stop, ', {}'.format(self.step) if self.step != 1 else '')
+
+    def iter_chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Yield the elements as consecutive IntRanges of at most chunk_size elements each
+        """
+        for offset in range(0, len(self._range), chunk_size):
+            yield self[offset:offset + chunk_size]
+
+    def iter_arrays(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Yield the elements as consecutive array.arrays of at most chunk_size elements each
+        """
+        for chunk in self.iter_chunks(chunk_size):
+            yield chunk.to_array()
+
+    def iter_json(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Yield pieces of text that join up to the JSON list of the elements
+        """
+        yield '['
+        separator = ''
+        for chunk in self.iter_chunks(chunk_size):
+            if chunk:
+                yield separator + ','.join(map(str, chunk))
+                separator = ','
+        yield ']'
+
+    def to_array(self):
+        """
+        Return the elements as an array.array of signed 64 bit ints, which supports the buffer protocol
+        """
+        return array(ARRAY_TYPECODE, self._range)
+
+    def to_numpy(self):
+        """
+        Return the elements as a NumPy int64 array
+        """
+        return np.arange(self.start, self.stop, self.step, dtype=np.int64)
+
+
 # noinspection PyUnusedLocal
 def generate(start, end):
-    raise NotImplementedError()
+    """
+    Return the integers from start up to, but not including, end
+    """
+    return IntRange(start, end)
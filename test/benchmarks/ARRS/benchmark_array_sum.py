@@ -0,0 +1,70 @@
+"""
+Throughput of array_sum.compute for each kind of input it accepts.
+
+Run from the repository root:
+
+    PYTHONPATH=lib:test python -m benchmarks.ARRS.benchmark_array_sum --output results.json
+
+Results are written as JSON: one record per (input kind, size) with the best and median time per call over the
+repeats and the best throughput in elements per second.
+"""
+import argparse
+import random
+from array import array
+
+import numpy as np
+
+from solutions.ARRS.array_sum import compute
+
+from benchmarks.harness import add_arguments, time_call, write_report
+
+DEFAULT_SIZES = (10 ** 3, 10 ** 5, 10 ** 7)
+
+
+def _values(size, rng):
+    return [rng.randrange(-2 ** 62, 2 ** 62) for _ in range(size)]
+
+
+# Input kind -> function building that kind of input from a list of ints
+INPUTS = {
+    'list': list,
+    'tuple': tuple,
+    'array.array': lambda values: array('q', values),
+    'numpy_int64': lambda values: np.array(values, dtype=np.int64),
+    'numpy_int32': lambda values: np.array(values, dtype=np.int64).astype(np.int32),
+    'memoryview': lambda values: memoryview(array('q', values)),
+    'numpy_strided': lambda values: np.array(values + values, dtype=np.int64)[::2],
+    'iterator': lambda values: values,
+}
+
+
+def run(kinds, sizes, repeats, seed=0):
+    results = []
+    for size in sizes:
+        values = _values(size, random.Random(seed))
+        for kind in kinds:
+            data = INPUTS[kind](values)
+            # Iterators are used up by a call, so each repeat gets a fresh one
+            timing = time_call(compute, repeats, setup=(lambda: iter(data)) if kind == 'iterator' else (lambda: data))
+            best = timing['best_ns']
+            results.append({
+                'kind': kind,
+                'size': size,
+                **timing,
+                'elements_per_second': size * 1e9 / best if best else None,
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark array_sum.compute per input type')
+    parser.add_argument('--kinds', nargs='+', choices=sorted(INPUTS), default=sorted(INPUTS))
+    parser.add_argument('--seed', type=int, default=0)
+    add_arguments(parser, DEFAULT_SIZES, 'number of elements')
+    args = parser.parse_args(argv)
+
+    write_report(run(args.kinds, args.sizes, args.repeats, args.seed), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Reproducible basket generators for checkout benchmarks.
+
+Each generator takes a size and a random.Random and returns a basket string of exactly that many items.
+"""
+from solutions.CHK import checkout_solution
+
+ALL_SKUS = ''.join(sorted(checkout_solution.prices))
+GROUP_SKUS = ''.join(sku for sku_list in checkout_solution.group_discount_offers for sku in sku_list)
+FREE_ITEM_SKUS = ''.join(sorted({
+    sku
+    for item, (free_sku, _, _) in checkout_solution.buy_x_get_y_free_offers.items()
+    for sku in (item, free_sku)
+}))
+
+
+def empty(size, rng):
+    return ''
+
+
+def all_one_sku(size, rng):
+    return 'A' * size
+
+
+def uniform(size, rng):
+    return ''.join(rng.choices(ALL_SKUS, k=size))
+
+
+def group_heavy(size, rng):
+    """
+    Mostly S/T/X/Y/Z, with a sprinkling of everything else
+    """
+    weights = [20 if sku in GROUP_SKUS else 1 for sku in ALL_SKUS]
+    return ''.join(rng.choices(ALL_SKUS, weights=weights, k=size))
+
+
+def free_item_heavy(size, rng):
+    """
+    Mostly the SKUs of buy X get Y free offers (E/B, F, N/M, R/Q, U), with a sprinkling of everything else
+    """
+    weights = [20 if sku in FREE_ITEM_SKUS else 1 for sku in ALL_SKUS]
+    return ''.join(rng.choices(ALL_SKUS, weights=weights, k=size))
+
+
+GENERATORS = {
+    'empty': empty,
+    'all_one_sku': all_one_sku,
+    'uniform': uniform,
+    'group_heavy': group_heavy,
+    'free_item_heavy': free_item_heavy,
+}
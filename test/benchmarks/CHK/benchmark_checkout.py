@@ -0,0 +1,89 @@
+"""
+Timing for checkout_solution, stage by stage, over generated baskets.
+
+Run from the repository root:
+
+    PYTHONPATH=lib:test python -m benchmarks.CHK.benchmark_checkout --output results.json
+
+Results are written as JSON: one record per (basket kind, size, stage) with the best and median time per call over
+the repeats, so runs from different commits can be compared directly.
+"""
+import argparse
+import random
+from array import array
+from collections import defaultdict
+
+from solutions.CHK import checkout_solution
+
+from benchmarks.CHK.basket_generators import GENERATORS
+from benchmarks.harness import add_arguments, time_call, write_report
+
+DEFAULT_SIZES = (0, 10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+
+# Basket kinds that give the same basket whatever the size asked for, timed once at this size
+FIXED_SIZE_KINDS = {'empty': 0}
+
+
+def _stages(basket):
+    """
+    Return (stage name, setup, call) for each stage. setup builds fresh input outside the timed region, as the run_*
+    and apply_* stages mutate the counts they are given.
+
+    checkout() prices on the price_book.* stages. The dict based reference pipeline stages keep their own names.
+    """
+    book = checkout_solution.get_price_book()
+    vector = book.count(basket)
+    vector_after_free = array(vector.typecode, vector)
+    book.apply_free_offers(vector_after_free)
+    vector_after_group = array(vector.typecode, vector_after_free)
+    book.apply_group_offers(vector_after_group)
+    vector_after_x_for_y = array(vector.typecode, vector_after_group)
+    book.apply_x_for_y_offers(vector_after_x_for_y)
+
+    counts = checkout_solution.build_counts_by_sku(basket)
+    after_free = checkout_solution.run_buy_x_get_y_free_offers(defaultdict(int, counts))
+    after_group = defaultdict(int, after_free)
+    checkout_solution.run_group_offers(after_group)
+    after_x_for_y = defaultdict(int, after_group)
+    checkout_solution.run_x_for_y_offers(after_x_for_y)
+
+    return [
+        ('checkout', lambda: basket, checkout_solution.checkout),
+        ('price_book.count', lambda: basket, book.count),
+        ('price_book.apply_free_offers', lambda: array(vector.typecode, vector), book.apply_free_offers),
+        ('price_book.apply_group_offers', lambda: array(vector.typecode, vector_after_free), book.apply_group_offers),
+        ('price_book.apply_x_for_y_offers', lambda: array(vector.typecode, vector_after_group),
+         book.apply_x_for_y_offers),
+        ('price_book.total_for_items', lambda: array(vector.typecode, vector_after_x_for_y), book.total_for_items),
+        ('reference_checkout', lambda: basket, checkout_solution.reference_checkout),
+        ('build_counts_by_sku', lambda: basket, checkout_solution.build_counts_by_sku),
+        ('run_buy_x_get_y_free_offers', lambda: defaultdict(int, counts),
+         checkout_solution.run_buy_x_get_y_free_offers),
+        ('run_group_offers', lambda: defaultdict(int, after_free), checkout_solution.run_group_offers),
+        ('run_x_for_y_offers', lambda: defaultdict(int, after_group), checkout_solution.run_x_for_y_offers),
+        ('total_for_items', lambda: defaultdict(int, after_x_for_y), checkout_solution.total_for_items),
+    ]
+
+
+def run(kinds, sizes, repeats, seed=0):
+    results = []
+    for kind in kinds:
+        for size in (FIXED_SIZE_KINDS[kind],) if kind in FIXED_SIZE_KINDS else sizes:
+            basket = GENERATORS[kind](size, random.Random(seed))
+            for stage, setup, call in _stages(basket):
+                results.append({'kind': kind, 'size': size, 'stage': stage, **time_call(call, repeats, setup)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark checkout_solution stage by stage')
+    parser.add_argument('--kinds', nargs='+', choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument('--seed', type=int, default=0)
+    add_arguments(parser, DEFAULT_SIZES, 'basket sizes in items, e.g. 100 10000000')
+    args = parser.parse_args(argv)
+
+    write_report(run(args.kinds, args.sizes, args.repeats, args.seed), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""
+Differential fuzzing and throughput regression checks across every checkout engine.
+
+Random and adversarial baskets are priced by each engine and every total is compared with the reference: the readable
+dict-based pipeline of reference_checkout(), fed by a validation and count step of its own rather than the price book's
+count(), which nearly every engine shares. The baskets include invalid characters, non-str input, counts on both sides of every
+offer threshold and very long strings. Each engine's throughput is then compared against a stored baseline.
+
+Run from the repository root:
+
+    PYTHONPATH=lib:test python -m benchmarks.CHK.fuzz_checkout --count 1000000
+
+The exit status is 1 if any engine disagrees with the reference, or if any engine's throughput fell more than
+--max-slowdown below the baseline. Throughput depends on the machine, so re-record the baseline on the machine that
+runs the check with --update-baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+from solutions.CHK import checkout_solution
+from solutions.CHK.basket import Basket
+from solutions.CHK.checkout_batch import checkout_many
+from solutions.CHK.checkout_cache import CheckoutCache
+from solutions.CHK.checkout_parallel import checkout_parallel
+from solutions.CHK.checkout_stream import checkout_stream
+from solutions.CHK.instrumentation import Instrumentation
+
+from benchmarks.CHK.basket_generators import ALL_SKUS
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'fuzz_baseline.json')
+
+DEFAULT_COUNT = 1000000
+DEFAULT_SEED = 0
+DEFAULT_MAX_SLOWDOWN = 0.3
+
+# Baskets generated and priced together, bounding memory whatever the count
+ROUND_SIZE = 50000
+
+# Lengths of the very long basket added to each round, in turn
+LONG_BASKET_LENGTHS = (10 ** 4, 10 ** 5, 10 ** 6)
+
+# Characters that are not SKUs, and inputs that are not strings
+INVALID_CHARACTERS = 'abz[]-_ 0\x00\n\xe9€'
+NON_STR_INPUTS = (None, 0, 65, 1.5, b'A', bytearray(b'AB'), ['A'], ('A',), {'A': 1})
+
+# Chunk size checkout_stream is fed with
+STREAM_CHUNK_SIZE = 7
+
+
+# ~~~~ Basket generation
+
+def _thresholds():
+    """
+    Return (sku, count) for every count at which an offer starts or stops applying once more
+    """
+    thresholds = []
+    for sku, offers in checkout_solution.special_offers.items():
+        for num_items_required, _ in offers:
+            thresholds.append((sku, num_items_required))
+    for trigger, (free_sku, num_required, num_free) in checkout_solution.buy_x_get_y_free_offers.items():
+        thresholds.append((trigger, num_required))
+        thresholds.append((free_sku, num_free))
+        if trigger == free_sku:
+            thresholds.append((trigger, num_required + num_free))
+    for skus, (amount_required, _) in checkout_solution.group_discount_offers.items():
+        for sku in skus:
+            thresholds.append((sku, amount_required))
+    return thresholds
+
+
+THRESHOLDS = _thresholds()
+
+
+def random_basket(rng):
+    return ''.join(rng.choices(ALL_SKUS, k=rng.randrange(40)))
+
+
+def boundary_basket(rng):
+    """
+    One to three SKUs each at a count just around a multiple of one of their offer thresholds, plus some noise
+    """
+    basket = []
+    for _ in range(rng.randint(1, 3)):
+        sku, threshold = rng.choice(THRESHOLDS)
+        basket.append(sku * max(0, threshold * rng.randint(1, 3) + rng.randint(-1, 1)))
+    basket.append(''.join(rng.choices(ALL_SKUS, k=rng.randrange(4))))
+    basket = ''.join(basket)
+    return ''.join(rng.sample(basket, len(basket))) if rng.random() < 0.5 else basket
+
+
+def invalid_basket(rng):
+    basket = list(random_basket(rng))
+    basket.insert(rng.randint(0, len(basket)), rng.choice(INVALID_CHARACTERS))
+    return ''.join(basket)
+
+
+def non_str_basket(rng):
+    return rng.choice(NON_STR_INPUTS)
+
+
+# Generator -> relative weight in the mix
+GENERATORS = (
+    (random_basket, 10),
+    (boundary_basket, 10),
+    (invalid_basket, 2),
+    (non_str_basket, 1),
+)
+
+
+def generate_round(size, round_number, rng):
+    generators, weights = zip(*GENERATORS)
+    baskets = [generator(rng) for generator in rng.choices(generators, weights=weights, k=size - 1)]
+    long_basket = ''.join(rng.choices(ALL_SKUS, k=LONG_BASKET_LENGTHS[round_number % len(LONG_BASKET_LENGTHS)]))
+    baskets.insert(rng.randrange(size), long_basket)
+    return baskets
+
+
+# ~~~~ Engines, each pricing a list of baskets
+
+def _reference(skus):
+    """
+    reference_checkout(), validating and counting the basket itself rather than through build_counts_by_sku
+    """
+    if type(skus) != str or not set(skus).issubset(checkout_solution.prices):
+        return -1
+    counts_per_sku = defaultdict(int, Counter(skus))
+    checkout_solution.run_buy_x_get_y_free_offers(counts_per_sku)
+    total = checkout_solution.run_group_offers(counts_per_sku)
+    total += checkout_solution.run_x_for_y_offers(counts_per_sku)
+    return total + checkout_solution.total_for_items(counts_per_sku)
+
+
+def _each(checkout):
+    return lambda baskets: [checkout(skus) for skus in baskets]
+
+
+def _explain(skus):
+    return checkout_solution.checkout(skus, explain=True).total
+
+
+def _stream(skus):
+    if isinstance(skus, (bytes, bytearray)):
+        # Byte chunks are valid stream input, unlike a bytes basket passed to checkout()
+        return -1
+    if type(skus) != str:
+        return checkout_stream([skus])
+    return checkout_stream(skus[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(skus), STREAM_CHUNK_SIZE))
+
+
+def _basket(skus):
+    if type(skus) != str:
+        return -1
+    basket = Basket()
+    try:
+        for sku in skus:
+            basket.add(sku)
+    except ValueError:
+        return -1
+    return basket.total
+
+
+def _cached():
+    cache = CheckoutCache()
+    return _each(cache.checkout)
+
+
+def _instrumented():
+    instrumentation = Instrumentation()
+    return _each(lambda skus: instrumentation.checkout(checkout_solution.get_price_book(), skus))
+
+
+# Engine name -> factory returning a function from a list of baskets to a list of totals
+ENGINES = {
+    'reference': lambda: _each(_reference),
+    'reference_checkout': lambda: _each(checkout_solution.reference_checkout),
+    'checkout': lambda: _each(checkout_solution.checkout),
+    'price_book': lambda: _each(checkout_solution.get_price_book().checkout),
+    'explain': lambda: _each(_explain),
+    'instrumented': _instrumented,
+    'cache': _cached,
+    'batch': lambda: lambda baskets: checkout_many(baskets).tolist(),
+    'stream': lambda: _each(_stream),
+    'basket': lambda: _each(_basket),
+    'parallel': lambda: lambda baskets: checkout_parallel(baskets, workers=2),
+}
+
+REFERENCE = 'reference'
+
+
+# ~~~~ Running
+
+def run(engines, count, seed=DEFAULT_SEED, max_mismatches=10):
+    """
+    Fuzz the given engines with count baskets. Return (throughput per engine in baskets per second, mismatches),
+    where each mismatch is (engine, basket, expected, actual). At most max_mismatches are kept.
+    """
+    rng = random.Random(seed)
+    priced = {name: ENGINES[name]() for name in engines}
+    reference = priced.get(REFERENCE) or ENGINES[REFERENCE]()
+    elapsed = dict.fromkeys(priced, 0.0)
+    mismatches = []
+
+    for round_number, start in enumerate(range(0, count, ROUND_SIZE)):
+        baskets = generate_round(min(ROUND_SIZE, count - start), round_number, rng)
+        totals_by_engine = {}
+        for name, price in priced.items():
+            started = time.perf_counter()
+            totals_by_engine[name] = price(baskets)
+            elapsed[name] += time.perf_counter() - started
+
+        expected = totals_by_engine.get(REFERENCE) or reference(baskets)
+        for name, totals in totals_by_engine.items():
+            if totals == expected:
+                continue
+            for skus, want, got in zip(baskets, expected, totals):
+                if want != got and len(mismatches) < max_mismatches:
+                    mismatches.append((name, skus, want, got))
+            if len(totals) != len(expected) and len(mismatches) < max_mismatches:
+                mismatches.append((name, None, len(expected), len(totals)))
+
+    throughput = {name: count / seconds if seconds else None for name, seconds in elapsed.items()}
+    return throughput, mismatches
+
+
+def compare_to_baseline(throughput, baseline, max_slowdown):
+    """
+    Return a message for every engine whose throughput fell more than max_slowdown (a fraction) below the baseline
+    """
+    regressions = []
+    for name, baskets_per_second in throughput.items():
+        expected = baseline.get(name)
+        if expected and baskets_per_second < expected * (1 - max_slowdown):
+            regressions.append('{}: {:.0f} baskets/s, baseline {:.0f} ({:.0%} slower)'.format(
+                name, baskets_per_second, expected, 1 - baskets_per_second / expected))
+    return regressions
+
+
+def _load_baseline(path):
+    try:
+        with open(path, 'rt') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _shorten(skus, limit=60):
+    text = repr(skus)
+    return text if len(text) <= limit else '{}... ({} items)'.format(text[:limit], len(skus))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fuzz every checkout engine against the reference and check '
+                                                 'throughput against a baseline')
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=list(ENGINES))
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT, help='number of baskets')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline throughput JSON file')
+    parser.add_argument('--max-slowdown', type=float, default=DEFAULT_MAX_SLOWDOWN,
+                        help='fraction below baseline throughput that counts as a regression')
+    parser.add_argument('--update-baseline', action='store_true', help='record this run as the new baseline')
+    args = parser.parse_args(argv)
+
+    throughput, mismatches = run(args.engines, args.count, args.seed)
+
+    for name, baskets_per_second in throughput.items():
+        print('{:<20} {:>12.0f} baskets/s'.format(name, baskets_per_second))
+
+    failed = False
+    for name, skus, expected, actual in mismatches:
+        failed = True
+        print('MISMATCH {}: {} expected {!r}, got {!r}'.format(name, _shorten(skus), expected, actual))
+
+    if args.update_baseline:
+        with open(args.baseline, 'wt') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'count': args.count,
+                'seed': args.seed,
+                'baskets_per_second': throughput,
+            }, f, indent=2)
+            f.write('\n')
+        print('Baseline written to {}'.format(args.baseline))
+    else:
+        baseline = _load_baseline(args.baseline)
+        if baseline is None:
+            print('No baseline at {}, skipping the throughput check'.format(args.baseline))
+        else:
+            for regression in compare_to_baseline(throughput, baseline['baskets_per_second'], args.max_slowdown):
+                failed = True
+                print('REGRESSION {}'.format(regression))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
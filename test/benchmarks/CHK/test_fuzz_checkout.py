@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks.CHK.fuzz_checkout import ENGINES, NON_STR_INPUTS, THRESHOLDS, _reference, run
+
+
+class TestThresholds():
+
+    def test_free_offer_thresholds(self):
+        # Buy 2 E get one B free, buy 3 N get one M free
+        assert {('E', 2), ('B', 1), ('N', 3), ('M', 1)} <= set(THRESHOLDS)
+        assert ('E', 1) not in THRESHOLDS
+        assert ('M', 3) not in THRESHOLDS
+        assert ('N', 1) not in THRESHOLDS
+
+    def test_self_referencing_free_offer_thresholds(self):
+        # Buy 2 F get one F free, buy 3 U get one U free
+        assert {('F', 1), ('F', 2), ('F', 3), ('U', 1), ('U', 3), ('U', 4)} <= set(THRESHOLDS)
+
+    def test_special_and_group_offer_thresholds(self):
+        assert {('A', 3), ('A', 5), ('H', 5), ('H', 10), ('S', 3), ('Z', 3)} <= set(THRESHOLDS)
+
+
+class TestReference():
+
+    @pytest.mark.parametrize('skus', ['a', 'A[', 'AB\x00', '\xe9', 'AB C'] + list(NON_STR_INPUTS))
+    def test_invalid_baskets(self, skus):
+        assert _reference(skus) == -1
+
+    @pytest.mark.parametrize('skus, total', [
+        ('', 0), ('A', 50), ('AAAAAAAA', 330), ('EEB', 80), ('FFF', 20), ('STXYZ', 82), ('HHHHHHHHHHHHHHH', 125),
+    ])
+    def test_totals(self, skus, total):
+        assert _reference(skus) == total
+
+
+class TestRun():
+
+    def test_engines_agree_with_the_reference(self):
+        engines = [name for name in ENGINES if name != 'parallel']
+        throughput, mismatches = run(engines, 500)
+        assert mismatches == []
+        assert set(throughput) == set(engines)
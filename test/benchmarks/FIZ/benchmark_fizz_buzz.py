@@ -0,0 +1,76 @@
+"""
+fizz_buzz_range and fill_fizz_buzz against a naive per-number loop.
+
+Run from the repository root:
+
+    PYTHONPATH=lib:test python -m benchmarks.FIZ.benchmark_fizz_buzz --output results.json
+
+Results are written as JSON: one record per (implementation, run length) with the best and median time over the
+repeats and the best throughput in numbers per second.
+"""
+import argparse
+from collections import deque
+
+from solutions.FIZ.fizz_buzz_solution import fill_fizz_buzz, fizz_buzz, fizz_buzz_range
+
+from benchmarks.harness import add_arguments, time_call, write_report
+
+DEFAULT_SIZES = (10 ** 3, 10 ** 5, 10 ** 7)
+START = 1
+
+
+def _naive_loop(start, stop):
+    out = []
+    for number in range(start, stop):
+        if number % 15 == 0:
+            out.append('fizz buzz')
+        elif number % 3 == 0:
+            out.append('fizz')
+        elif number % 5 == 0:
+            out.append('buzz')
+        else:
+            out.append(str(number))
+    return out
+
+
+def _consume(iterable):
+    deque(iterable, maxlen=0)
+
+
+# Implementation -> function answering every number in [start, stop)
+IMPLEMENTATIONS = {
+    'naive_loop': _naive_loop,
+    'scalar_fizz_buzz': lambda start, stop: [fizz_buzz(number) for number in range(start, stop)],
+    'fizz_buzz_range': lambda start, stop: _consume(fizz_buzz_range(start, stop)),
+    'fill_fizz_buzz': lambda start, stop: fill_fizz_buzz([None] * (stop - start), start),
+}
+
+
+def run(names, sizes, repeats):
+    results = []
+    for size in sizes:
+        for name in names:
+            call = IMPLEMENTATIONS[name]
+            timing = time_call(lambda: call(START, START + size), repeats)
+            best = timing['best_ns']
+            results.append({
+                'implementation': name,
+                'size': size,
+                **timing,
+                'numbers_per_second': size * 1e9 / best if best else None,
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark fizz_buzz over runs of consecutive numbers')
+    parser.add_argument('--implementations', nargs='+', choices=sorted(IMPLEMENTATIONS),
+                        default=sorted(IMPLEMENTATIONS))
+    add_arguments(parser, DEFAULT_SIZES, 'numbers per run')
+    args = parser.parse_args(argv)
+
+    write_report(run(args.implementations, args.sizes, args.repeats), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+What every benchmark shares: the --sizes, --repeats and --output arguments, the timing loop, and the JSON report with
+the commit, Python version and machine the results were taken on.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_REPEATS = 5
+
+
+def add_arguments(parser, default_sizes, sizes_help):
+    parser.add_argument('--sizes', nargs='+', type=int, default=default_sizes, help=sizes_help)
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--output', help='file to write the JSON results to (default: stdout)')
+    return parser
+
+
+def time_call(call, repeats, setup=None):
+    """
+    Time repeats calls, returning the repeats, best_ns and median_ns fields of a result record. With setup, each call
+    is passed a fresh setup(), built outside the timed region, for calls that use up or mutate their input.
+    """
+    clock = time.perf_counter_ns
+    timings = []
+    for _ in range(repeats):
+        if setup is None:
+            start = clock()
+            call()
+        else:
+            argument = setup()
+            start = clock()
+            call(argument)
+        timings.append(clock() - start)
+    return {
+        'repeats': repeats,
+        'best_ns': min(timings),
+        'median_ns': int(statistics.median(timings)),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(results, output=None):
+    """
+    Write results as a JSON report to the file named output, or to stdout when output is None
+    """
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    if output:
+        with open(output, 'wt') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
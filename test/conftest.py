@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Benchmarks run as benchmarks.<challenge>.<module> with test/ on the path, so their tests import them the same way
+sys.path.insert(0, os.path.dirname(__file__))
@@ -0,0 +1,225 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from tdl.queue.abstractions.request import Request
+from tdl.queue.processing_rules import ProcessingRules
+from tdl.queue.transport.remote_broker import RemoteBroker
+
+from runner.async_runner import AsyncApplyProcessingRules, AsyncRemoteBroker, _init_worker
+from runner.solution_registry import default_registry
+
+
+class FakeBroker:
+
+    def __init__(self):
+        self.responses = []
+        self.stopped = False
+
+    def respond_to(self, headers, response):
+        self.responses.append((headers, response.id, response.result))
+
+    def stop(self):
+        self.stopped = True
+
+
+class FakeAudit:
+
+    def __init__(self):
+        self.exceptions = []
+
+    def start_line(self):
+        pass
+
+    def log(self, auditable):
+        pass
+
+    def end_line(self):
+        pass
+
+    def log_exception(self, message, e):
+        self.exceptions.append((message, e))
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=8)
+    yield executor
+    executor.shutdown()
+
+
+def _rules(**implementations):
+    rules = ProcessingRules()
+    for method_name, implementation in implementations.items():
+        rules.on(method_name).call(implementation).build()
+    return rules
+
+
+def _handler(rules, loop, executor, max_in_flight=8, worker_methods=()):
+    return AsyncApplyProcessingRules(rules, FakeAudit(), loop, executor, max_in_flight, worker_methods)
+
+
+class TestAsyncApplyProcessingRules():
+
+    def test_responds_in_the_order_requests_arrived(self, loop, executor):
+        handler = _handler(_rules(sleep=lambda seconds, label: time.sleep(seconds) or label), loop, executor)
+        broker = FakeBroker()
+        for number, seconds in enumerate((0.2, 0.1, 0.0, 0.05)):
+            request_id = 'R{}'.format(number)
+            handler.process_next_request_from(broker, {'message-id': request_id},
+                                              Request('sleep', [seconds, number], request_id))
+        handler.drain()
+        assert broker.responses == [({'message-id': 'R{}'.format(n)}, 'R{}'.format(n), n) for n in range(4)]
+
+    def test_limits_requests_in_flight(self, loop, executor):
+        release = threading.Event()
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def block():
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            release.wait(5)
+            with lock:
+                running[0] -= 1
+            return 'done'
+
+        handler = _handler(_rules(block=block), loop, executor, max_in_flight=2)
+        broker = FakeBroker()
+        feeder = threading.Thread(target=lambda: [
+            handler.process_next_request_from(broker, {}, Request('block', [], 'R{}'.format(n))) for n in range(5)])
+        feeder.start()
+        deadline = time.monotonic() + 5
+        while running[0] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        assert running[0] == 2
+        assert feeder.is_alive()
+        release.set()
+        feeder.join(5)
+        handler.drain()
+        assert running[1] == 2
+        assert [request_id for _, request_id, _ in broker.responses] == ['R{}'.format(n) for n in range(5)]
+
+    def test_stops_after_fatal_error_response(self, loop, executor):
+        def fail_on_two(x):
+            if x == 2:
+                raise ValueError('two')
+            return x
+
+        handler = _handler(_rules(check=fail_on_two), loop, executor)
+        broker = FakeBroker()
+        for x in (1, 2, 3):
+            handler.process_next_request_from(broker, {}, Request('check', [x], 'R{}'.format(x)))
+        handler.drain()
+        assert broker.stopped
+        assert broker.responses == [({}, 'R1', 1)]
+
+    def test_unknown_method_stops(self, loop, executor):
+        handler = _handler(_rules(), loop, executor)
+        broker = FakeBroker()
+        handler.process_next_request_from(broker, {}, Request('nope', [], 'R1'))
+        handler.drain()
+        assert broker.stopped
+        assert broker.responses == []
+
+    def test_stats(self, loop, executor):
+        handler = _handler(_rules(echo=lambda x: x), loop, executor)
+        broker = FakeBroker()
+        for x in range(4):
+            handler.process_next_request_from(broker, {}, Request('echo', [x], 'R{}'.format(x)))
+        handler.drain()
+        stats = handler.stats(2.0)
+        assert stats['requests'] == 4
+        assert stats['elapsed_seconds'] == 2.0
+        assert stats['requests_per_second'] == 2.0
+        assert 0 <= stats['latency_p50_ms'] <= stats['latency_p99_ms'] <= stats['latency_max_ms']
+
+    def test_stats_without_requests(self, loop, executor):
+        stats = _handler(_rules(), loop, executor).stats(0.0)
+        assert stats['requests'] == 0
+        assert stats['requests_per_second'] == 0.0
+        assert stats['latency_max_ms'] == 0.0
+
+    def test_busy_from_expect_request_until_responded(self, loop, executor):
+        handler = _handler(_rules(echo=lambda x: x), loop, executor)
+        idle_calls = []
+        handler.on_idle = lambda: idle_calls.append(handler.is_idle())
+        assert handler.is_idle()
+        handler.expect_request()
+        assert not handler.is_idle()
+        handler.process_next_request_from(FakeBroker(), {}, Request('echo', [1], 'R1'))
+        handler.drain()
+        assert handler.is_idle()
+        assert idle_calls == [True]
+
+    def test_runs_registered_solutions_on_worker_processes(self, loop):
+        with ProcessPoolExecutor(1, initializer=_init_worker, initargs=(default_registry,)) as executor:
+            rules = _rules(display_description=lambda *_: 'OK')
+            handler = _handler(rules, loop, executor, worker_methods=default_registry().method_names())
+            broker = FakeBroker()
+            handler.process_next_request_from(broker, {}, Request('sum', [1, 2], 'R1'))
+            handler.process_next_request_from(broker, {}, Request('int_range', [0, 3], 'R2'))
+            handler.process_next_request_from(broker, {}, Request('display_description', ['x'], 'R3'))
+            handler.process_next_request_from(broker, {}, Request('sum', ['a'], 'R4'))
+            handler.drain()
+        assert broker.responses == [({}, 'R1', 3), ({}, 'R2', [0, 1, 2]), ({}, 'R3', 'OK')]
+        assert broker.stopped
+
+
+class TestAsyncRemoteBroker():
+
+    @pytest.fixture
+    def broker(self, monkeypatch, loop, executor):
+        def init(self, *args):
+            self.request_timeout_millis = 60000
+            self._timer = None
+
+        def fail(release):
+            release.wait(5)
+            raise ValueError('fail')
+
+        monkeypatch.setattr(RemoteBroker, '__init__', init)
+        handler = _handler(_rules(echo=lambda x: x, fail=fail), loop, executor)
+        broker = AsyncRemoteBroker(handler, 'localhost', 61613, 'requests', 'responses', 60000)
+        yield broker
+        if broker._timer is not None:
+            broker._timer.cancel()
+
+    def test_idle_timer_waits_for_the_request_being_handed_over(self, broker):
+        # The listener has received a request and stopped the timer, then the last request in flight finishes
+        broker.stop_timer()
+        broker._handler.on_idle()
+        assert broker._timer is None
+
+        broker._handler.process_next_request_from(FakeBroker(), {}, Request('echo', [1], 'R1'))
+        broker._handler.drain()
+        assert broker._timer is not None and broker._timer.is_alive()
+
+    def test_idle_timer_closes_the_connection_after_a_fatal_error(self, broker):
+        closed = threading.Event()
+        broker.close = closed.set
+        broker.request_timeout_millis = 10
+        # As tdl's listener hands a request over: the timer restarts while the request is still in flight
+        release = threading.Event()
+        broker.stop_timer()
+        broker._handler.process_next_request_from(FakeBroker(), {}, Request('fail', [release], 'R1'))
+        broker.start_timer()
+        assert broker._timer is None
+        release.set()
+        broker._handler.drain()
+        assert closed.wait(5)
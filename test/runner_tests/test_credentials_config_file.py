@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from runner import credentials_config_file
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / 'credentials.config'
+    path.write_text('tdl_username=alice\ntdl_use_colours=true\n# comment\ntdl_token="abc\\=="\n')
+    monkeypatch.setattr(credentials_config_file, 'CONFIG_FILE_PATH', str(path))
+    monkeypatch.setattr(credentials_config_file, '_cached_properties', None)
+    return path
+
+
+def _touch_later(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+class TestConfigFile():
+
+    def test_reads_properties(self, config_file):
+        assert credentials_config_file.read_from_config_file('tdl_username') == 'alice'
+        assert credentials_config_file.read_from_config_file('tdl_use_colours') is True
+        assert credentials_config_file.read_from_config_file('tdl_token') == 'abc=='
+        assert credentials_config_file.read_from_config_file_with_default('missing', 'x') == 'x'
+
+    def test_parsed_once(self, config_file, monkeypatch):
+        calls = []
+        load_properties = credentials_config_file.load_properties
+        monkeypatch.setattr(credentials_config_file, 'load_properties',
+                            lambda path: calls.append(path) or load_properties(path))
+        for _ in range(3):
+            credentials_config_file.read_from_config_file('tdl_username')
+        credentials_config_file.read_config()
+        assert calls == [str(config_file)]
+
+    def test_reread_after_mtime_change(self, config_file):
+        assert credentials_config_file.read_from_config_file('tdl_username') == 'alice'
+        config_file.write_text('tdl_username=bob\n')
+        _touch_later(config_file)
+        assert credentials_config_file.read_from_config_file('tdl_username') == 'bob'
+
+    def test_read_config_is_read_only(self, config_file):
+        config = credentials_config_file.read_config()
+        assert config['tdl_username'] == 'alice'
+        with pytest.raises(TypeError):
+            config['tdl_username'] = 'mallory'
+        assert credentials_config_file.read_from_config_file('tdl_username') == 'alice'
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from runner.replay import MIN_LATENCY, NUM_BUCKETS, LatencyHistogram, replay
+from runner.solution_registry import SolutionRegistry
+
+
+@pytest.fixture
+def registry():
+    return SolutionRegistry({
+        'sum': 'solutions.SUM.sum_solution:compute',
+        'int_range': 'solutions.IRNG.int_range:generate',
+        'missing': 'solutions.no_such_module:compute',
+    })
+
+
+def _line(method, params, expected=None):
+    request = {'method': method, 'params': params, 'id': 'R1'}
+    if expected is not None:
+        request['expected'] = expected
+    return json.dumps(request)
+
+
+class TestLatencyHistogram():
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(0.5) == 0.0
+        assert histogram.count == 0
+
+    def test_percentiles_are_bucket_upper_bounds(self):
+        histogram = LatencyHistogram()
+        for _ in range(99):
+            histogram.record(0.001)
+        histogram.record(1.0)
+        assert histogram.count == 100
+        assert histogram.max == 1.0
+        assert histogram.total == pytest.approx(1.099)
+        assert 0.001 <= histogram.percentile(0.5) < 0.001 * 2 ** 0.25
+        assert histogram.percentile(0.99) == histogram.percentile(0.5)
+        assert histogram.percentile(1.0) == 1.0
+
+    def test_extremes_land_in_the_end_buckets(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.0)
+        histogram.record(MIN_LATENCY / 2)
+        histogram.record(10 ** 6)
+        assert histogram.counts[0] == 2
+        assert histogram.counts[NUM_BUCKETS - 1] == 1
+        assert sum(histogram.counts) == 3
+
+
+class TestReplay():
+
+    def test_matches(self, registry):
+        report = replay([
+            _line('sum', [1, 2], 3),
+            _line('int_range', [0, 3], [0, 1, 2]),
+            _line('sum', [2, 2]),
+        ], registry)
+        assert report.ok
+        assert report.requests == 3
+        assert report.checked == 2
+        assert report.latencies['sum'].count == 2
+        assert report.latencies['int_range'].count == 1
+
+    def test_results_are_compared_in_wire_form(self, registry):
+        report = replay([_line('int_range', [0, 3], [0, 1, 3])], registry)
+        assert report.mismatch_count == 1
+        assert report.mismatches[0]['actual'] == [0, 1, 2]
+
+    def test_counts_mismatches_but_keeps_only_the_first(self, registry):
+        lines = [_line('sum', [1, n], 0) for n in range(5)]
+        report = replay(lines, registry, max_mismatches=2)
+        assert not report.ok
+        assert report.mismatch_count == 5
+        assert [mismatch['line'] for mismatch in report.mismatches] == [1, 2]
+        assert report.mismatches[0] == {
+            'line': 1, 'id': 'R1', 'method': 'sum', 'params': [1, 0], 'expected': 0, 'actual': 1,
+        }
+
+    def test_errors(self, registry):
+        report = replay([
+            _line('sum', [1], 3),
+            _line('missing', [1]),
+        ], registry)
+        assert report.requests == 2
+        assert report.error_count == 2
+        assert report.checked == 0
+        assert not report.ok
+        assert [(error['line'], error['method']) for error in report.errors] == [(1, 'sum'), (2, 'missing')]
+        assert report.errors[0]['error'].startswith('TypeError: ')
+        assert report.errors[1]['error'].startswith('ModuleNotFoundError: ')
+        assert 'line 1 (R1): sum(1,) raised TypeError: ' in report.format()
+
+    def test_keeps_only_the_first_errors(self, registry):
+        report = replay([_line('sum', [n]) for n in range(5)], registry, max_mismatches=2)
+        assert report.error_count == 5
+        assert [error['line'] for error in report.errors] == [1, 2]
+        assert report.as_dict()['first_errors'] == report.errors
+
+    def test_invalid_lines(self, registry):
+        report = replay([
+            'not json',
+            '[]',
+            json.dumps({'params': [1, 2]}),
+            json.dumps({'method': 'sum'}),
+            json.dumps({'method': 'unknown', 'params': []}),
+            json.dumps({'method': ['sum'], 'params': [1, 2]}),
+            json.dumps({'method': 'sum', 'params': 'ab'}),
+            '',
+            '   ',
+        ], registry)
+        assert report.invalid_lines == 7
+        assert report.requests == 0
+        assert not report.ok
+
+    def test_report(self, registry):
+        report = replay([_line('sum', [1, 2], 3), _line('sum', [1, 2], 4)], registry)
+        summary = report.as_dict()
+        assert summary['requests'] == 2
+        assert summary['mismatches'] == 1
+        assert summary['methods']['sum']['requests'] == 2
+        text = report.format()
+        assert text.startswith('Replayed 2 requests')
+        assert 'line 2 (R1): sum(1, 2) expected 4, got 3' in text
@@ -0,0 +1,56 @@
+import sys
+
+import pytest
+
+from runner.solution_registry import SOLUTIONS, SolutionRegistry, default_registry
+
+MODULE_NAME = 'registry_test_solution'
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    (tmp_path / '{}.py'.format(MODULE_NAME)).write_text('def double(x):\n    return 2 * x\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield SolutionRegistry({'double': '{}:double'.format(MODULE_NAME)})
+    sys.modules.pop(MODULE_NAME, None)
+
+
+class TestSolutionRegistry():
+
+    def test_lazy_does_not_import_until_called(self, registry):
+        double = registry.lazy('double')
+        assert MODULE_NAME not in sys.modules
+        assert double.__name__ == 'double'
+        assert double(21) == 42
+        assert MODULE_NAME in sys.modules
+        assert MODULE_NAME in registry.import_timings
+
+    def test_resolve_caches(self, registry):
+        first = registry.resolve('double')
+        sys.modules.pop(MODULE_NAME)
+        assert registry.resolve('double') is first
+        assert MODULE_NAME not in sys.modules
+
+    def test_declare_replaces_resolved(self, registry):
+        registry.resolve('double')
+        registry.declare('double', 'solutions.SUM.sum_solution:compute')
+        assert registry.resolve('double')(1, 2) == 3
+
+    def test_unknown_name_raises_key_error(self, registry):
+        with pytest.raises(KeyError):
+            registry.lazy('triple')
+        with pytest.raises(KeyError):
+            registry.resolve('triple')
+
+    def test_format_import_timings(self):
+        registry = SolutionRegistry()
+        registry.import_timings = {'fast': 0.000001, 'slow': 0.25}
+        assert registry.format_import_timings().splitlines() == [
+            'import time: cumulative [us] | module',
+            'import time:          250000 | slow',
+            'import time:               1 | fast',
+        ]
+
+    def test_default_registry_declares_every_solution(self):
+        assert default_registry().method_names() == list(SOLUTIONS)
+
@@ -0,0 +1,60 @@
+from array import array
+
+import numpy as np
+
+from solutions.ARRS import array_sum
+from solutions.ARRS.array_sum import compute
+
+INT64_MAX = 2 ** 63 - 1
+UINT64_MAX = 2 ** 64 - 1
+
+
+class TestArraySum():
+
+    def test_empty(self):
+        assert compute([]) == 0
+        assert compute(array('q')) == 0
+        assert compute(np.array([], dtype=np.int64)) == 0
+
+    def test_list_and_tuple(self):
+        assert compute([1, 2, 3]) == 6
+        assert compute((-1, 5)) == 4
+
+    def test_array_types(self):
+        for typecode in 'bBhHiIlLqQ':
+            assert compute(array(typecode, [1, 2, 3, 4])) == 10
+
+    def test_numpy_dtypes(self):
+        for dtype in (np.int8, np.uint8, np.int16, np.uint16, np.int32, np.uint32, np.int64, np.uint64):
+            assert compute(np.arange(100, dtype=dtype)) == 4950
+
+    def test_bool_array(self):
+        assert compute(np.array([True, False, True])) == 2
+
+    def test_other_buffers(self):
+        assert compute(b'\x01\x02\x03') == 6
+        assert compute(bytearray(b'\xff\xff')) == 510
+        assert compute(memoryview(array('q', range(10)))[::2]) == 20
+
+    def test_non_contiguous_and_multidimensional_arrays(self):
+        values = np.arange(20, dtype=np.int64).reshape(4, 5)
+        assert compute(values) == 190
+        assert compute(values[:, ::2]) == sum(v for v in range(20) if v % 5 in (0, 2, 4))
+
+    def test_int64_overflow(self):
+        assert compute(np.full(10, INT64_MAX, dtype=np.int64)) == 10 * INT64_MAX
+        assert compute(array('q', [-INT64_MAX - 1] * 10)) == 10 * (-INT64_MAX - 1)
+        assert compute(np.array([INT64_MAX, INT64_MAX, -INT64_MAX, 3], dtype=np.int64)) == INT64_MAX + 3
+
+    def test_uint64_overflow(self):
+        assert compute(np.full(7, UINT64_MAX, dtype=np.uint64)) == 7 * UINT64_MAX
+
+    def test_overflow_across_chunks(self, monkeypatch):
+        monkeypatch.setattr(array_sum, 'CHUNK_SIZE', 3)
+        values = [INT64_MAX, 1, INT64_MAX, -5, INT64_MAX, INT64_MAX, 12]
+        assert compute(np.array(values, dtype=np.int64)) == sum(values)
+
+    def test_generic_iterables(self):
+        assert compute(range(1, 101)) == 5050
+        assert compute(x for x in [2 ** 70, 1]) == 2 ** 70 + 1
+        assert compute(array('d', [1.5, 2.5])) == 4.0
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from solutions.CHK import checkout_solution
+from solutions.CHK.basket import Basket
+from solutions.CHK.price_book import PriceBook
+
+
+def _basket_string(basket, book):
+    return ''.join(sku * basket.count(sku) for sku in book.skus)
+
+
+class TestBasket():
+
+    def test_empty_basket(self):
+        basket = Basket()
+        assert basket.total == 0
+        assert len(basket) == 0
+
+    def test_running_total(self):
+        basket = Basket()
+        totals = []
+        for sku in 'AAAAA':
+            basket.add(sku)
+            totals.append(basket.total)
+        assert totals == [50, 100, 130, 180, 200]
+
+    def test_free_item_added_after_trigger(self):
+        basket = Basket()
+        for sku in 'EEB':
+            basket.add(sku)
+        assert basket.total == 80
+        basket.remove('E')
+        assert basket.total == 70
+
+    def test_unknown_sku(self):
+        with pytest.raises(ValueError):
+            Basket().add('[')
+
+    def test_remove_missing_sku(self):
+        with pytest.raises(ValueError):
+            Basket().remove('A')
+
+    def test_random_scans_match_checkout(self):
+        rng = random.Random(5)
+        book = checkout_solution.get_price_book()
+        basket = Basket()
+        for _ in range(3000):
+            sku = rng.choice(book.skus)
+            if basket.count(sku) and rng.random() < 0.4:
+                basket.remove(sku)
+            else:
+                basket.add(sku)
+            assert basket.total == checkout_solution.checkout(_basket_string(basket, book))
+
+    def test_chained_offers_and_overlapping_groups(self):
+        """
+        Offers listed in an order where a trigger is made free by a later offer, and groups sharing members, must
+        still give the same totals as pricing the whole basket
+        """
+        book = PriceBook(
+            {'A': 10, 'B': 20, 'C': 30, 'D': 40, 'E': 50},
+            {'C': [(2, 50)], 'E': [(3, 120)]},
+            {('A', 'B', 'C'): (2, 35), ('C', 'D'): (2, 60)},
+            {'B': ('C', 1, 1), 'A': ('B', 2, 1), 'E': ('E', 2, 1)},
+        )
+        rng = random.Random(6)
+        basket = Basket(book)
+        for _ in range(3000):
+            sku = rng.choice(book.skus)
+            if basket.count(sku) and rng.random() < 0.4:
+                basket.remove(sku)
+            else:
+                basket.add(sku)
+            assert basket.total == book.checkout(_basket_string(basket, book))
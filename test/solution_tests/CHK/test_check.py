@@ -150,6 +150,15 @@ class TestRunBuyXGetYFreeOffers():
         offers_ran = checkout_solution.run_buy_x_get_y_free_offers(counts_per_sku)
         assert _remove_zero_skus(offers_ran) == {'F': 4}
 
+    def test_offers_with_absent_trigger_are_skipped(self):
+        """
+        Offers whose trigger sku is not in the basket do not run, so they add nothing to the counts
+        """
+        counts_per_sku = checkout_solution.build_counts_by_sku('ABM')
+
+        offers_ran = checkout_solution.run_buy_x_get_y_free_offers(counts_per_sku)
+        assert offers_ran == {'A': 1, 'B': 1, 'M': 1}
+
 
 class TestGroupDiscountOffers():
 
@@ -265,4 +274,24 @@ class TestOffersIntegration():
         # Then add all remaining values for total
         # 30 + 120 + 30 + 17 == 200
         # Final total 572
-        assert checkout_solution.checkout(basket) == 572
\ No newline at end of file
+        assert checkout_solution.checkout(basket) == 572
+
+
+class TestCountVectorPipeline():
+    """
+    The in place count vector forms of the run_* helpers
+    """
+
+    def test_matches_dict_pipeline(self):
+        basket = 8 * 'A' + 2 * 'B' + 3 * 'E' + 4 * 'F' + 2 * 'X' + 2 * 'Y'
+        counts = checkout_solution.build_count_vector(basket)
+        checkout_solution.run_buy_x_get_y_free_offers_in_place(counts)
+        total = checkout_solution.run_group_offers_in_place(counts)
+        total += checkout_solution.run_x_for_y_offers_in_place(counts)
+        total += checkout_solution.total_for_count_vector(counts)
+        assert total == 572
+
+    def test_vector_has_a_slot_per_letter(self):
+        counts = checkout_solution.build_count_vector('AZZ')
+        assert len(counts) == 26
+        assert (counts[0], counts[25]) == (1, 2)
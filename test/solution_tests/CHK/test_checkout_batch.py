@@ -0,0 +1,44 @@
+import random
+
+import numpy as np
+
+from solutions.CHK import checkout_solution
+from solutions.CHK.checkout_batch import checkout_many
+from solutions.CHK.price_book import PriceBook
+
+
+class TestCheckoutMany():
+
+    def test_empty_list(self):
+        result = checkout_many([])
+        assert result.shape == (0,)
+
+    def test_empty_basket(self):
+        assert checkout_many(['']).tolist() == [0]
+
+    def test_invalid_rows_are_minus_one(self):
+        result = checkout_many(['A', 1, 'AB[', 'é', None, 'B'])
+        assert result.tolist() == [50, -1, -1, -1, -1, 30]
+
+    def test_returns_int_array(self):
+        assert checkout_many(['AAA']).dtype == np.int64
+
+    def test_all_rules(self):
+        basket = 8 * 'A' + 2 * 'B' + 3 * 'E' + 4 * 'F' + 2 * 'X' + 2 * 'Y'
+        assert checkout_many([basket, 'EEEEBBB']).tolist() == [572, (4 * 40) + 30]
+
+    def test_matches_scalar_checkout(self):
+        rng = random.Random(2)
+        skus = ''.join(checkout_solution.prices)
+        baskets = [
+            ''.join(rng.choice(skus) for _ in range(rng.randrange(60)))
+            for _ in range(3000)
+        ]
+        baskets += ['AB[', 42]
+        expected = [checkout_solution.checkout(basket) for basket in baskets]
+        assert checkout_many(baskets).tolist() == expected
+
+    def test_self_referencing_offer_with_more_than_one_free(self):
+        book = PriceBook({'F': 10, 'E': 5}, {}, {}, {'F': ('F', 2, 2), 'E': ('F', 3, 1)})
+        baskets = ['F' * count + 'E' * (count % 4) for count in range(12)]
+        assert checkout_many(baskets, book).tolist() == [book.checkout(basket) for basket in baskets]
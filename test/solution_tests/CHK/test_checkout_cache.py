@@ -0,0 +1,50 @@
+import pytest
+
+from solutions.CHK import checkout_solution
+from solutions.CHK.checkout_cache import CheckoutCache
+
+
+class TestCheckoutCache():
+
+    def test_reordered_basket_is_a_hit(self):
+        cache = CheckoutCache()
+        assert cache.checkout('ABC') == 100
+        assert cache.checkout('CBA') == 100
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_invalid_input_is_not_cached(self):
+        cache = CheckoutCache()
+        assert cache.checkout('AB[') == -1
+        assert cache.checkout(1) == -1
+        assert len(cache) == 0
+
+    def test_least_recently_used_evicted(self):
+        cache = CheckoutCache(max_size=2)
+        cache.checkout('A')
+        cache.checkout('B')
+        cache.checkout('A')
+        cache.checkout('C')
+        assert len(cache) == 2
+        cache.checkout('A')
+        cache.checkout('B')
+        assert (cache.hits, cache.misses) == (2, 4)
+
+    def test_invalidated_when_price_book_changes(self):
+        cache = CheckoutCache()
+        try:
+            assert cache.checkout('A') == 50
+            checkout_solution.prices['A'] = 60
+            checkout_solution.reload_price_book()
+            assert cache.checkout('A') == 60
+            assert cache.misses == 2
+        finally:
+            checkout_solution.prices['A'] = 50
+            checkout_solution.reload_price_book()
+
+    def test_optimal_mode(self):
+        cache = CheckoutCache(mode=checkout_solution.OPTIMAL)
+        assert cache.checkout('AAA') == checkout_solution.checkout('AAA', mode=checkout_solution.OPTIMAL)
+
+    def test_invalid_max_size(self):
+        with pytest.raises(ValueError):
+            CheckoutCache(max_size=0)
@@ -0,0 +1,32 @@
+import pickle
+import random
+
+from solutions.CHK import checkout_solution
+from solutions.CHK.checkout_parallel import checkout_parallel, main
+
+
+class TestCheckoutParallel():
+
+    def test_results_in_input_order(self):
+        rng = random.Random(9)
+        skus = ''.join(checkout_solution.prices)
+        baskets = [''.join(rng.choice(skus) for _ in range(rng.randrange(30))) for _ in range(500)]
+        baskets += ['AB[', 1]
+        expected = [checkout_solution.checkout(basket) for basket in baskets]
+        assert checkout_parallel(baskets, workers=2, batch_size=7) == expected
+
+    def test_no_baskets(self):
+        assert checkout_parallel([], workers=1) == []
+
+    def test_price_book_pickles_without_optimal_pricer(self):
+        book = checkout_solution.get_price_book()
+        book.optimal_pricer()
+        copy = pickle.loads(pickle.dumps(book))
+        assert copy.checkout('AAA') == 130
+        assert copy.optimal_pricer().checkout('AAA') == 130
+
+    def test_command_line(self, tmp_path, capsys):
+        path = tmp_path / 'baskets.txt'
+        path.write_text('AAA\n\nAB[\nEEB\n')
+        main([str(path), '--workers', '1'])
+        assert capsys.readouterr().out == '130\n0\n-1\n80\n'
@@ -0,0 +1,51 @@
+from solutions.CHK import checkout_solution
+from solutions.CHK.checkout_stream import checkout_file, checkout_stream
+
+
+class TestCheckoutStream():
+
+    def test_no_chunks(self):
+        assert checkout_stream([]) == 0
+
+    def test_offers_span_chunks(self):
+        # 5A for 200 and 2 Es giving a free B, with every offer split across chunks
+        assert checkout_stream(['AA', 'AE', 'AAB', 'E']) == checkout_solution.checkout('AAAEAABE')
+
+    def test_str_and_bytes_chunks(self):
+        assert checkout_stream(['AB', b'CD', bytearray(b'E')]) == checkout_solution.checkout('ABCDE')
+
+    def test_invalid_chunk_type(self):
+        assert checkout_stream(['A', 1]) == -1
+
+    def test_invalid_character_short_circuits(self):
+        consumed = []
+
+        def chunks():
+            for chunk in ['AB', 'A[', 'C', 'D']:
+                consumed.append(chunk)
+                yield chunk
+
+        assert checkout_stream(chunks()) == -1
+        assert consumed == ['AB', 'A[']
+
+    def test_non_ascii_chunk(self):
+        assert checkout_stream(['A', 'é']) == -1
+
+
+class TestCheckoutFile():
+
+    def test_file_read_in_blocks(self, tmp_path):
+        basket = 8 * 'A' + 2 * 'B' + 3 * 'E' + 4 * 'F' + 2 * 'X' + 2 * 'Y'
+        path = tmp_path / 'basket'
+        path.write_text(basket * 50)
+        assert checkout_file(path, block_size=7) == checkout_solution.checkout(basket * 50)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / 'basket'
+        path.write_text('')
+        assert checkout_file(path) == 0
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / 'basket'
+        path.write_text('AAA\n')
+        assert checkout_file(path) == -1
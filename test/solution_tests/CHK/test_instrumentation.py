@@ -0,0 +1,56 @@
+from solutions.CHK import checkout_solution
+from solutions.CHK.instrumentation import STAGES, Histogram, Instrumentation
+
+
+class TestHistogram():
+
+    def test_buckets_by_bit_length(self):
+        histogram = Histogram()
+        for value in (0, 1, 3, 4, 1000):
+            histogram.record(value)
+        assert histogram.count == 5
+        assert histogram.total == 1008
+        assert histogram.as_dict()['buckets'] == {1: 1, 2: 1, 4: 1, 8: 1, 1024: 1}
+
+    def test_percentile_upper_bound(self):
+        histogram = Histogram()
+        for value in range(100):
+            histogram.record(value)
+        assert 49 <= histogram.percentile(0.5) <= 2 * 49
+        assert Histogram().percentile(0.5) == 0
+
+
+class TestInstrumentation():
+
+    def test_records_stages_sizes_and_offers(self):
+        calls = []
+        instrumentation = Instrumentation(callbacks=[lambda stage, elapsed: calls.append(stage)])
+        checkout_solution.set_instrumentation(instrumentation)
+        try:
+            basket = 8 * 'A' + 2 * 'B' + 3 * 'E' + 4 * 'F' + 2 * 'X' + 2 * 'Y'
+            assert checkout_solution.checkout(basket) == 572
+            assert checkout_solution.checkout('AB[') == -1
+        finally:
+            checkout_solution.set_instrumentation(None)
+
+        assert calls == list(STAGES) + ['count']
+        assert instrumentation.stage_times['count'].count == 2
+        assert instrumentation.stage_times['total_for_items'].count == 1
+        assert instrumentation.basket_sizes.total == len(basket)
+        assert instrumentation.offer_hits == {
+            'free:E': 1, 'free:F': 1, 'group:ZSTYX': 1, 'ladder:A:5': 1, 'ladder:A:3': 1,
+        }
+
+    def test_matches_uninstrumented_totals(self):
+        instrumentation = Instrumentation()
+        for basket in ('', 'AAAAA', 'EEBB', 'STXYZ', 'HHHHHHHHHHHHHHH'):
+            assert instrumentation.checkout(checkout_solution.get_price_book(), basket) == \
+                checkout_solution.checkout(basket)
+
+    def test_snapshot(self):
+        instrumentation = Instrumentation()
+        instrumentation.checkout(checkout_solution.get_price_book(), 'AAA')
+        snapshot = instrumentation.snapshot()
+        assert set(snapshot['stage_times_ns']) == set(STAGES)
+        assert snapshot['offer_hits'] == {'ladder:A:3': 1}
+        assert snapshot['offer_savings'] == {'ladder:A:3': 20}
@@ -0,0 +1,206 @@
+import random
+import time
+from functools import lru_cache
+from itertools import combinations_with_replacement, product
+from math import lcm
+
+import pytest
+
+from solutions.CHK import checkout_solution
+from solutions.CHK.optimal import DEFAULT_MAX_QUANTITY, OptimalPricer
+from solutions.CHK.price_book import PriceBook, new_counts
+
+
+def _counts(book, **counts_by_sku):
+    counts = new_counts()
+    for sku, count in counts_by_sku.items():
+        counts[book.slot_by_sku[sku]] = count
+    return counts
+
+
+def _line_cost_function(book):
+    @lru_cache(maxsize=None)
+    def line_cost(slot, count):
+        if not count:
+            return 0
+        bundles = ((1, book.unit_prices[slot]),) + book.ladders[slot]
+        return min(price + line_cost(slot, count - size) for size, price in bundles if size <= count)
+
+    return line_cost
+
+
+def _brute_force_total(book, counts):
+    """
+    Try every way of forming group bundles, pricing what is left with the cheapest mix of each SKU's ladder
+    """
+    counts = list(counts)
+    book.apply_free_offers(counts)
+    line_cost = _line_cost_function(book)
+
+    @lru_cache(maxsize=None)
+    def best(state):
+        result = sum(line_cost(slot, count) for slot, count in enumerate(state))
+        for members, amount_required, price in book.group_offers:
+            for combo in combinations_with_replacement(members, amount_required):
+                remaining = list(state)
+                for slot in combo:
+                    remaining[slot] -= 1
+                if min(remaining) >= 0:
+                    result = min(result, price + best(tuple(remaining)))
+        return result
+
+    return best(tuple(counts))
+
+
+def _every_split_total(book, counts):
+    """
+    Try every split of each SKU's items between its groups and its ladder, keeping the cheapest cost for each
+    combination of the groups' item counts modulo their bundle sizes. Slower than bundle by bundle brute force for
+    small counts, but practical for counts well past the cost tables' periodic point.
+    """
+    counts = list(counts)
+    book.apply_free_offers(counts)
+    line_cost = _line_cost_function(book)
+    moduli = [amount_required for _, amount_required, _ in book.group_offers]
+    scale = lcm(*moduli)
+    costs = {(0,) * len(moduli): 0}
+    for slot, count in enumerate(counts):
+        groups = [index for index, (members, _, _) in enumerate(book.group_offers) if slot in members]
+        options = {}
+        for takes in product(*(range(count + 1) for _ in groups)):
+            if sum(takes) > count:
+                continue
+            handed = [0] * len(moduli)
+            cost = scale * line_cost(slot, count - sum(takes))
+            for index, taken in zip(groups, takes):
+                handed[index] = taken
+                _, amount_required, price = book.group_offers[index]
+                cost += taken * price * scale // amount_required
+            options[tuple(handed)] = min(cost, options.get(tuple(handed), cost))
+        next_costs = {}
+        for residues, cost in costs.items():
+            for handed, option in options.items():
+                key = tuple((residue + taken) % modulus for residue, taken, modulus in zip(residues, handed, moduli))
+                next_costs[key] = min(cost + option, next_costs.get(key, cost + option))
+        costs = next_costs
+    return costs[(0,) * len(moduli)] // scale
+
+
+# Greedy pricing gets every one of these wrong: 4 for 100 beats 3 for 60 on paper, a group bundle costing more
+# than its items, and a group member whose own ladder is a better use of its items
+NON_GREEDY_BOOK = PriceBook(
+    {'A': 50, 'B': 10, 'C': 12, 'D': 30, 'E': 25},
+    {'A': [(4, 100), (3, 60)], 'D': [(2, 40)]},
+    {('B', 'C'): (3, 45), ('D', 'E'): (2, 50)},
+    {},
+)
+
+
+# The first group has its items used most expensive first, D before C, which leaves the second group short
+OVERLAPPING_BOOK = PriceBook(
+    {'A': 6, 'B': 34, 'C': 26, 'D': 36},
+    {'B': [(3, 11)]},
+    {('A', 'C', 'D'): (3, 69), ('C', 'B'): (3, 47)},
+    {},
+)
+
+
+def _random_overlapping_book(rng):
+    skus = 'ABCDE'
+    prices = {sku: rng.randint(5, 40) for sku in skus}
+    ladders = {sku: [(rng.randint(2, 3), rng.randint(10, 60))] for sku in rng.sample(skus, 2)}
+    groups = {}
+    for _ in range(rng.randint(2, 3)):
+        members = tuple(rng.sample(skus, rng.randint(2, 3)))
+        groups[members] = (rng.randint(2, 3), rng.randint(20, 80))
+    return PriceBook(prices, ladders, groups, {})
+
+
+class TestOptimalPricer():
+
+    def test_beats_greedy_ladder(self):
+        assert NON_GREEDY_BOOK.checkout('AAAAAA') == 200
+        assert NON_GREEDY_BOOK.optimal_pricer().checkout('AAAAAA') == 120
+
+    def test_skips_group_bundle_worth_less_than_its_items(self):
+        assert NON_GREEDY_BOOK.checkout('BBB') == 45
+        assert NON_GREEDY_BOOK.optimal_pricer().checkout('BBB') == 30
+
+    def test_keeps_laddered_member_out_of_group(self):
+        # Greedy: D+D for 50, then E at 25. Optimal: D+D for 40 on D's own ladder, then E at 25
+        assert NON_GREEDY_BOOK.checkout('DDE') == 75
+        assert NON_GREEDY_BOOK.optimal_pricer().checkout('DDE') == 65
+
+    def test_invalid_input(self):
+        assert NON_GREEDY_BOOK.optimal_pricer().checkout('A[') == -1
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        for book in (NON_GREEDY_BOOK, OVERLAPPING_BOOK):
+            pricer = book.optimal_pricer()
+            for _ in range(300):
+                counts = _counts(book, **{sku: rng.randrange(7) for sku in book.skus})
+                assert pricer.price(counts) == _brute_force_total(book, counts)
+
+    def test_overlapping_groups(self):
+        counts = _counts(OVERLAPPING_BOOK, A=1, B=3, C=3, D=3)
+        assert OVERLAPPING_BOOK.optimal_pricer().price(counts) == 133 == _brute_force_total(OVERLAPPING_BOOK, counts)
+
+    def test_matches_brute_force_with_overlapping_groups(self):
+        rng = random.Random(6)
+        for _ in range(30):
+            book = _random_overlapping_book(rng)
+            pricer = book.optimal_pricer()
+            for _ in range(15):
+                counts = _counts(book, **{sku: rng.randrange(4) for sku in book.skus})
+                assert pricer.price(counts) == _brute_force_total(book, counts)
+
+    def test_matches_every_split_for_large_counts(self):
+        rng = random.Random(9)
+        for _ in range(8):
+            book = _random_overlapping_book(rng)
+            pricer = book.optimal_pricer()
+            for _ in range(3):
+                counts = _counts(book, **{sku: rng.randrange(12, 40) for sku in book.skus})
+                assert pricer.price(counts) == _every_split_total(book, counts)
+
+    def test_large_baskets_take_time_independent_of_size(self):
+        overlapping = PriceBook(
+            {'C': 20, 'D': 15, 'E': 40, 'F': 10, 'G': 20}, {},
+            {('C', 'D', 'E'): (3, 45), ('E', 'F', 'G'): (3, 40)}, {},
+        )
+        laddered = PriceBook({'A': 50, 'S': 20, 'T': 20}, {'A': [(5, 200), (3, 130)]}, {('A', 'S', 'T'): (3, 45)}, {})
+        for book, basket in ((overlapping, 'CDEFG' * 20000), (laddered, 'AST' * 50000)):
+            counts = book.count(basket)
+            started = time.perf_counter()
+            book.optimal_pricer().price(counts)
+            # A few milliseconds here, where trying every split of the items would take hours
+            assert time.perf_counter() - started < 1.0
+
+    def test_line_cost_beyond_table(self):
+        small = OptimalPricer(NON_GREEDY_BOOK, max_quantity=1)
+        large = OptimalPricer(NON_GREEDY_BOOK, max_quantity=2000)
+        slot = NON_GREEDY_BOOK.slot_by_sku['A']
+        for count in range(0, 2000, 7):
+            assert small.line_cost(slot, count) == large.line_cost(slot, count)
+
+
+class TestCheckoutMode():
+
+    def test_optimal_matches_greedy_for_current_tables(self):
+        rng = random.Random(8)
+        skus = ''.join(checkout_solution.prices)
+        for _ in range(500):
+            basket = ''.join(rng.choice(skus) for _ in range(rng.randrange(40)))
+            assert checkout_solution.checkout(basket, mode=checkout_solution.OPTIMAL) == \
+                checkout_solution.checkout(basket)
+
+    def test_max_quantity(self):
+        book = checkout_solution.get_price_book()
+        assert checkout_solution.checkout('AAAAA', mode=checkout_solution.OPTIMAL, max_quantity=10) == 200
+        assert book.optimal_pricer(10).max_quantity == 10
+        assert book.optimal_pricer().max_quantity == DEFAULT_MAX_QUANTITY
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            checkout_solution.checkout('A', mode='cheapest')
@@ -0,0 +1,246 @@
+import random
+
+import pytest
+
+from solutions.CHK import checkout_solution
+from solutions.CHK.price_book import NUM_SLOTS, PriceBook, new_counts
+
+
+def _book():
+    return PriceBook(
+        checkout_solution.prices,
+        checkout_solution.special_offers,
+        checkout_solution.group_discount_offers,
+        checkout_solution.buy_x_get_y_free_offers,
+    )
+
+
+def _counts(book, **counts_by_sku):
+    counts = new_counts()
+    for sku, count in counts_by_sku.items():
+        counts[book.slot_by_sku[sku]] = count
+    return counts
+
+
+class TestCompile():
+
+    def test_slots_follow_sku_order(self):
+        book = _book()
+        assert book.skus[0] == 'A'
+        assert book.slot_by_sku['X'] == 23
+        assert book.unit_prices[book.slot_by_sku['X']] == 17
+
+    def test_slots_are_fixed_for_partial_books(self):
+        book = PriceBook({'C': 20, 'A': 50}, {}, {}, {})
+        assert book.skus == ('A', 'C')
+        assert book.slot_by_sku == {'A': 0, 'C': 2}
+        assert len(book.unit_prices) == NUM_SLOTS
+        assert book.count('CC') == _counts(book, C=2)
+        with pytest.raises(ValueError):
+            book.count('B')
+
+    def test_skus_outside_a_to_z_rejected(self):
+        with pytest.raises(ValueError):
+            PriceBook({'a': 1}, {}, {}, {})
+
+    def test_ladders_are_largest_bundle_first(self):
+        book = PriceBook({'A': 50}, {'A': [(3, 130), (5, 200)]}, {}, {})
+        assert book.ladders[0] == ((5, 200), (3, 130))
+
+    def test_bundles_of_the_same_size_keep_listed_order(self):
+        book = PriceBook({'A': 50}, {'A': [(3, 120), (3, 130), (5, 200)]}, {}, {})
+        assert book.ladders[0] == ((5, 200), (3, 120), (3, 130))
+
+    def test_self_referencing_free_offer_compiles_to_combined_group(self):
+        book = _book()
+        f = book.slot_by_sku['F']
+        assert (f, f, 3, 1, 2) in book.free_offers
+
+
+class TestCount():
+
+    def test_count_vector(self):
+        book = _book()
+        assert book.count('ABA') == _counts(book, A=2, B=1)
+
+    def test_long_basket_count_vector(self):
+        book = _book()
+        assert book.count(100 * 'AB' + 'Z') == _counts(book, A=100, B=100, Z=1)
+
+    @pytest.mark.parametrize('skus', [1, None, b'A', 'a', 'AB[', 'Aé', 100 * 'A' + '[', 100 * 'A' + 'é'])
+    def test_invalid_input_raises(self, skus):
+        with pytest.raises(ValueError):
+            _book().count(skus)
+
+    def test_count_bytes(self):
+        book = _book()
+        assert book.count_bytes(b'ABA') == _counts(book, A=2, B=1)
+        with pytest.raises(ValueError):
+            book.count_bytes(b'A\n')
+
+    def test_non_ascii_skus_rejected_at_compile(self):
+        with pytest.raises(ValueError):
+            PriceBook({'é': 1}, {}, {}, {})
+
+
+class TestStages():
+
+    def test_free_offers(self):
+        book = _book()
+        counts = _counts(book, E=4, B=1, F=3)
+        book.apply_free_offers(counts)
+        assert counts == _counts(book, E=4, F=2)
+
+    def test_group_offers(self):
+        book = _book()
+        counts = _counts(book, S=3, T=2, X=3, Y=2)
+        assert book.apply_group_offers(counts) == 135
+        assert counts == _counts(book, X=1)
+
+    def test_x_for_y_offers(self):
+        book = _book()
+        counts = _counts(book, A=9, B=3)
+        assert book.apply_x_for_y_offers(counts) == 200 + 130 + 45
+        assert counts == _counts(book, A=1, B=1)
+
+    def test_stages_work_on_memoryview(self):
+        book = _book()
+        counts = _counts(book, A=9, E=2, B=1, S=3)
+        view = memoryview(counts)
+        book.apply_free_offers(view)
+        assert book.apply_group_offers(view) == 45
+        assert book.apply_x_for_y_offers(view) == 330
+        assert book.total_for_items(view) == 50 + 80
+        assert counts == _counts(book, A=1, E=2)
+
+    def test_price_does_not_mutate_counts(self):
+        book = _book()
+        counts = _counts(book, A=3)
+        assert book.price(counts) == 130
+        assert counts == _counts(book, A=3)
+
+
+class TestMatchesReference():
+
+    def test_random_baskets(self):
+        book = _book()
+        rng = random.Random(1)
+        skus = ''.join(book.skus)
+        for _ in range(2000):
+            basket = ''.join(rng.choice(skus) for _ in range(rng.randrange(40)))
+            assert book.checkout(basket) == checkout_solution.reference_checkout(basket)
+
+    def test_invalid_baskets(self):
+        assert _book().checkout('AB[') == -1
+        assert _book().checkout(1) == -1
+
+    def test_same_size_bundles_match_reference(self):
+        try:
+            checkout_solution.special_offers['A'] = [(3, 120), (3, 130)]
+            checkout_solution.reload_price_book()
+            assert checkout_solution.checkout('AAA') == checkout_solution.reference_checkout('AAA') == 120
+        finally:
+            checkout_solution.special_offers['A'] = [(5, 200), (3, 130)]
+            checkout_solution.reload_price_book()
+
+    def test_reload_picks_up_table_changes(self):
+        try:
+            checkout_solution.prices['A'] = 60
+            assert checkout_solution.checkout('A') == 50
+            checkout_solution.reload_price_book()
+            assert checkout_solution.checkout('A') == 60
+        finally:
+            checkout_solution.prices['A'] = 50
+            checkout_solution.reload_price_book()
+
+
+class TestGroupOffers():
+
+    def test_most_expensive_members_consumed_first(self):
+        book = PriceBook({'A': 10, 'B': 30, 'C': 20}, {}, {('A', 'B', 'C'): (2, 35)}, {})
+        assert book.group_offers[0][0] == (1, 2, 0)
+        counts = _counts(book, A=1, B=1, C=1)
+        assert book.apply_group_offers(counts) == 35
+        assert counts == _counts(book, A=1)
+
+    def test_price_ties_keep_listed_order(self):
+        book = _book()
+        assert [book.skus[slot] for slot in book.group_offers[0][0]] == ['Z', 'S', 'T', 'Y', 'X']
+
+    def test_overlapping_groups_applied_in_listed_order(self):
+        book = PriceBook(
+            {'A': 10, 'B': 20, 'C': 30},
+            {},
+            {('A', 'B'): (2, 25), ('B', 'C'): (2, 45)},
+            {},
+        )
+        counts = _counts(book, A=1, B=2, C=1)
+        # The A+B group runs first and takes both Bs, leaving the B+C group with only C
+        assert book.apply_group_offers(counts) == 25
+        assert counts == _counts(book, A=1, C=1)
+
+    def test_groups_without_items_are_skipped(self):
+        calls = []
+        book = PriceBook(
+            {'A': 10, 'B': 20, 'C': 30, 'D': 40},
+            {},
+            {('A', 'B'): (2, 25), ('C', 'D'): (2, 60)},
+            {},
+        )
+        counts = _counts(book, C=1, D=1)
+        assert book.apply_group_offers(counts, lambda offer_id, times, saving: calls.append(offer_id)) == 60
+        assert calls == ['group:CD']
+
+    def test_reference_pipeline_consumes_in_price_order(self):
+        try:
+            checkout_solution.group_discount_offers[('X', 'A')] = (2, 60)
+            checkout_solution.reload_price_book()
+            for basket in ('XA', 'XAA', 'XXA', 'XXAAZ'):
+                assert checkout_solution.checkout(basket) == checkout_solution.reference_checkout(basket)
+        finally:
+            del checkout_solution.group_discount_offers[('X', 'A')]
+            checkout_solution.reload_price_book()
+
+
+class TestFreeOffers():
+
+    def test_chained_offers_run_in_dependency_order(self):
+        """
+        A gives a B free and B gives a C free. However they are listed, free Bs must be removed before B triggers
+        its own offer.
+        """
+        for offers in ({'B': ('C', 1, 1), 'A': ('B', 1, 1)}, {'A': ('B', 1, 1), 'B': ('C', 1, 1)}):
+            book = PriceBook({'A': 10, 'B': 20, 'C': 30}, {}, {}, offers)
+            counts = _counts(book, A=1, B=1, C=1)
+            book.apply_free_offers(counts)
+            assert counts == _counts(book, A=1, C=1)
+
+    def test_cycle_falls_back_to_listed_order(self):
+        book = PriceBook({'A': 10, 'B': 20}, {}, {}, {'A': ('B', 1, 1), 'B': ('A', 1, 1)})
+        assert book.free_offer_ids == ('free:A', 'free:B')
+
+    @pytest.mark.parametrize('count, expected', [
+        # Buy 2 get 2 free: 4 items are 2 paid and 2 free, a 3rd item alone is already free
+        (2, 2), (3, 2), (4, 2), (5, 3), (6, 4), (7, 4), (8, 4), (9, 5),
+    ])
+    def test_self_referencing_offer_with_more_than_one_free(self, count, expected):
+        offers = {'F': ('F', 2, 2)}
+        book = PriceBook({'F': 10}, {}, {}, offers)
+        counts = _counts(book, F=count)
+        book.apply_free_offers(counts)
+        assert counts == _counts(book, F=expected)
+
+        try:
+            checkout_solution.buy_x_get_y_free_offers['F'] = ('F', 2, 2)
+            assert checkout_solution.run_buy_x_get_y_free_offers(
+                checkout_solution.build_counts_by_sku('F' * count))['F'] == expected
+        finally:
+            checkout_solution.buy_x_get_y_free_offers['F'] = ('F', 2, 1)
+
+    def test_offers_with_absent_trigger_do_not_fire(self):
+        calls = []
+        book = _book()
+        counts = _counts(book, B=3, M=1)
+        book.apply_free_offers(counts, lambda offer_id, quantity, saving: calls.append(offer_id))
+        assert calls == []
+        assert counts == _counts(book, B=3, M=1)
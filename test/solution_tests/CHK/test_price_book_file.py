@@ -0,0 +1,183 @@
+import json
+import os
+import random
+import time
+
+import pytest
+
+from solutions.CHK import checkout_solution, price_book_file
+from solutions.CHK.price_book_file import PriceBookFile, load_price_book, price_book_from_dict
+
+SAMPLE_PATH = os.path.join(os.path.dirname(checkout_solution.__file__), 'price_book.json')
+
+
+def _tables(**changes):
+    with open(SAMPLE_PATH) as f:
+        tables = json.load(f)
+    tables.update(changes)
+    return tables
+
+
+def _tables_with_price(sku, price):
+    tables = _tables()
+    tables['prices'][sku] = price
+    return tables
+
+
+TOML_BOOK = """
+[prices]
+A = 50
+B = 30
+E = 40
+S = 20
+T = 20
+X = 17
+
+[special_offers]
+A = [[5, 200], [3, 130]]
+
+[buy_x_get_y_free_offers]
+E = ["B", 2, 1]
+
+[[group_discount_offers]]
+skus = ["S", "T", "X"]
+quantity = 3
+price = 45
+"""
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def restore_price_book():
+    yield
+    checkout_solution.reload_price_book()
+
+
+class TestLoadPriceBook():
+
+    def test_sample_file_matches_builtin_tables(self):
+        book = load_price_book(SAMPLE_PATH)
+        rng = random.Random(10)
+        for _ in range(500):
+            basket = ''.join(rng.choice(book.skus) for _ in range(rng.randrange(40)))
+            assert book.checkout(basket) == checkout_solution.reference_checkout(basket)
+
+    def test_version_is_content_hash(self, tmp_path):
+        path = tmp_path / 'book.json'
+        path.write_text(json.dumps(_tables()))
+        first = load_price_book(path).version
+        path.write_text(json.dumps(_tables_with_price('A', 1)))
+        assert load_price_book(path).version != first
+
+    def test_toml_file(self, tmp_path):
+        path = tmp_path / 'book.toml'
+        path.write_text(TOML_BOOK)
+        book = load_price_book(path)
+        assert book.checkout('AAA') == 130
+        assert book.checkout('AAAAAAAA') == 330
+        assert book.checkout('EEB') == 80
+        assert book.checkout('STXX') == 62
+        assert book.checkout('C') == -1
+        same_book = price_book_from_dict({
+            'prices': {'A': 50, 'B': 30, 'E': 40, 'S': 20, 'T': 20, 'X': 17},
+            'special_offers': {'A': [[5, 200], [3, 130]]},
+            'group_discount_offers': [{'skus': ['S', 'T', 'X'], 'quantity': 3, 'price': 45}],
+            'buy_x_get_y_free_offers': {'E': ['B', 2, 1]},
+        })
+        rng = random.Random(12)
+        for _ in range(200):
+            basket = ''.join(rng.choice('ABESTX') for _ in range(rng.randrange(20)))
+            assert book.checkout(basket) == same_book.checkout(basket)
+
+    def test_toml_file_without_a_toml_parser(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(price_book_file, 'tomllib', None)
+        path = tmp_path / 'book.toml'
+        path.write_text(TOML_BOOK)
+        with pytest.raises(ValueError):
+            load_price_book(path)
+
+    @pytest.mark.parametrize('changes', [
+        {'prices': {}},
+        {'prices': {'AB': 10}},
+        {'prices': {'A': -1}},
+        {'prices': {'A': 1.5}},
+        {'special_offers': {'[': [[2, 10]]}},
+        {'special_offers': {'A': [[0, 10]]}},
+        {'special_offers': {'A': [[2]]}},
+        {'group_discount_offers': [{'skus': ['A', 'A'], 'quantity': 2, 'price': 10}]},
+        {'group_discount_offers': [{'skus': ['A', '['], 'quantity': 2, 'price': 10}]},
+        {'group_discount_offers': [{'skus': ['A'], 'quantity': 0, 'price': 10}]},
+        {'buy_x_get_y_free_offers': {'A': ['[', 2, 1]}},
+        {'buy_x_get_y_free_offers': {'A': ['B', 2, 0]}},
+        {'prices': {'a': 10}},
+        {'prices': {'[': 10}},
+        {'special_offers': []},
+        {'special_offers': {'A': 5}},
+        {'special_offers': {'A': [5]}},
+        {'group_discount_offers': {}},
+        {'group_discount_offers': [{'skus': [['A', 'B']], 'quantity': 2, 'price': 10}]},
+        {'buy_x_get_y_free_offers': []},
+        {'buy_x_get_y_free_offers': {'A': [['B'], 2, 1]}},
+    ])
+    def test_invalid_tables(self, changes):
+        with pytest.raises(ValueError):
+            price_book_from_dict(_tables(**changes))
+
+
+class TestPriceBookFile():
+
+    def test_refresh_installs_changed_file(self, tmp_path, restore_price_book):
+        path = tmp_path / 'book.json'
+        path.write_text(json.dumps(_tables_with_price('A', 60)))
+        watcher = PriceBookFile(path)
+        assert watcher.refresh()
+        assert checkout_solution.checkout('A') == 60
+        assert not watcher.refresh()
+
+        path.write_text(json.dumps(_tables_with_price('A', 70)))
+        os.utime(path, ns=(1, 1))
+        assert watcher.refresh()
+        assert checkout_solution.checkout('A') == 70
+
+    def test_bad_file_keeps_current_book(self, tmp_path, restore_price_book):
+        path = tmp_path / 'book.json'
+        path.write_text(json.dumps(_tables_with_price('A', 60)))
+        watcher = PriceBookFile(path)
+        watcher.refresh()
+
+        path.write_text('{"prices": {}}')
+        os.utime(path, ns=(1, 1))
+        with pytest.raises(ValueError):
+            watcher.refresh()
+        assert checkout_solution.checkout('A') == 60
+
+    def test_background_polling(self, tmp_path, restore_price_book):
+        path = tmp_path / 'book.json'
+        path.write_text(json.dumps(_tables_with_price('A', 60)))
+        watcher = PriceBookFile(path, poll_interval=0.01).start()
+        try:
+            assert checkout_solution.get_price_book().version == load_price_book(path).version
+        finally:
+            watcher.stop()
+
+    def test_polling_survives_malformed_tables(self, tmp_path, restore_price_book):
+        path = tmp_path / 'book.json'
+        path.write_text(json.dumps(_tables_with_price('A', 60)))
+        watcher = PriceBookFile(path, poll_interval=0.01).start()
+        try:
+            path.write_text(json.dumps(_tables(special_offers=[])))
+            os.utime(path, ns=(1, 1))
+            _wait_for(lambda: watcher.last_error is not None)
+            assert isinstance(watcher.last_error, ValueError)
+
+            path.write_text(json.dumps(_tables_with_price('A', 70)))
+            os.utime(path, ns=(2, 2))
+            _wait_for(lambda: checkout_solution.checkout('A') == 70)
+        finally:
+            watcher.stop()
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from solutions.CHK import checkout_solution
+from solutions.CHK.price_book import PriceBook
+from solutions.CHK.receipt import Receipt
+
+
+class TestExplain():
+
+    def test_no_offers(self):
+        assert checkout_solution.checkout('ABCD', explain=True) == Receipt(115, [])
+
+    def test_invalid_basket(self):
+        assert checkout_solution.checkout('AB[', explain=True) == Receipt(-1, [])
+
+    def test_lines_for_every_kind_of_offer(self):
+        basket = 8 * 'A' + 2 * 'B' + 3 * 'E' + 4 * 'F' + 2 * 'X' + 2 * 'Y'
+        receipt = checkout_solution.checkout(basket, explain=True)
+        assert receipt.total == 572
+        assert receipt.lines == [
+            ('free:E', 1, 30),
+            ('free:F', 1, 10),
+            # Y, Y and X at list price
+            ('group:ZSTYX', 1, 20 + 20 + 17 - 45),
+            ('ladder:A:5', 1, 5 * 50 - 200),
+            ('ladder:A:3', 1, 3 * 50 - 130),
+        ]
+        assert receipt.saving == 30 + 10 + 12 + 50 + 20
+
+    def test_free_offer_with_nothing_to_free_is_not_listed(self):
+        assert checkout_solution.checkout('EE', explain=True).lines == []
+
+    def test_free_item_saving_counts_only_items_in_basket(self):
+        receipt = checkout_solution.checkout('EEEEB', explain=True)
+        # Two Bs could be freed but only one is in the basket
+        assert receipt.lines == [('free:E', 1, 30)]
+
+    def test_free_offer_quantity_is_items_freed(self):
+        receipt = checkout_solution.checkout('EEEEBB', explain=True)
+        assert receipt.lines == [('free:E', 2, 60)]
+        receipt = checkout_solution.checkout('FFFFFF', explain=True)
+        assert receipt.lines == [('free:F', 2, 20)]
+
+    def test_saving_is_list_price_minus_total(self):
+        rng = random.Random(23)
+        skus = ''.join(checkout_solution.prices)
+        book = checkout_solution.get_price_book()
+        for _ in range(500):
+            basket = ''.join(rng.choice(skus) for _ in range(rng.randrange(40)))
+            receipt = checkout_solution.checkout(basket, explain=True)
+            assert receipt.total == checkout_solution.checkout(basket)
+            assert receipt.saving == book.total_for_items(book.count(basket)) - receipt.total
+
+    def test_only_for_greedy_checkout(self):
+        with pytest.raises(ValueError):
+            checkout_solution.checkout('A', checkout_solution.OPTIMAL, explain=True)
+
+    def test_as_dict(self):
+        book = PriceBook({'A': 50}, {'A': [(3, 130)]}, {}, {})
+        assert book.explain('AAAA').as_dict() == {
+            'total': 180,
+            'saving': 20,
+            'lines': [{'offer_id': 'ladder:A:3', 'quantity': 1, 'saving': 20}],
+        }
@@ -0,0 +1,47 @@
+import itertools
+import random
+
+from solutions.CHK import checkout_solution
+from solutions.CHL import checklite_solution
+from solutions.CHL.checklite_solution import checklite
+
+
+class TestChecklite():
+
+    def test_empty_basket(self):
+        assert checklite('') == 0
+
+    def test_single_items(self):
+        assert [checklite(sku) for sku in 'ABCD'] == [50, 30, 20, 15]
+
+    def test_offers(self):
+        assert checklite('AAA') == 130
+        assert checklite('BB') == 45
+        assert checklite('AAAAAAABBBCD') == 2 * 130 + 50 + 45 + 30 + 20 + 15
+
+    def test_no_five_a_offer(self):
+        assert checklite('AAAAA') == 130 + 2 * 50
+
+    def test_invalid_input(self):
+        assert checklite('E') == -1
+        assert checklite('a') == -1
+        assert checklite('AB-') == -1
+        assert checklite('ABCDABCDE') == -1
+        assert checklite(None) == -1
+        assert checklite(3) == -1
+
+    def test_short_table_matches_price_book(self):
+        for length in range(checklite_solution.SHORT_BASKET_LENGTH + 1):
+            for basket in itertools.combinations_with_replacement('ABCD', length):
+                basket = ''.join(basket)
+                assert checklite(basket) == checklite_solution.price_book.checkout(basket)
+
+    def test_consistent_with_checkout_for_shared_rules(self):
+        """
+        checkout also has 5A for 200, so only baskets with fewer than five A use exactly the shared rules
+        """
+        rng = random.Random(19)
+        for _ in range(2000):
+            basket = 'A' * rng.randrange(5) + ''.join(rng.choice('BCD') for _ in range(rng.randrange(20)))
+            basket = ''.join(rng.sample(basket, len(basket)))
+            assert checklite(basket) == checkout_solution.checkout(basket)
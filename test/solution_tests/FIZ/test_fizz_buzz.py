@@ -0,0 +1,60 @@
+from solutions.FIZ import fizz_buzz_solution
+from solutions.FIZ.fizz_buzz_solution import fill_fizz_buzz, fizz_buzz, fizz_buzz_range
+
+
+def _naive(number):
+    if number % 15 == 0:
+        return 'fizz buzz'
+    if number % 3 == 0:
+        return 'fizz'
+    if number % 5 == 0:
+        return 'buzz'
+    return str(number)
+
+
+class TestFizzBuzz():
+
+    def test_numbers(self):
+        assert fizz_buzz(1) == '1'
+        assert fizz_buzz(3) == 'fizz'
+        assert fizz_buzz(5) == 'buzz'
+        assert fizz_buzz(15) == 'fizz buzz'
+        assert fizz_buzz(22) == '22'
+
+    def test_matches_naive(self):
+        for number in range(-50, 200):
+            assert fizz_buzz(number) == _naive(number)
+
+
+class TestFizzBuzzRange():
+
+    def test_empty(self):
+        assert list(fizz_buzz_range(5, 5)) == []
+        assert list(fizz_buzz_range(5, 1)) == []
+
+    def test_short_ranges_at_every_phase(self):
+        for start in range(-15, 16):
+            for length in range(40):
+                assert list(fizz_buzz_range(start, start + length)) == [
+                    _naive(n) for n in range(start, start + length)]
+
+    def test_spans_several_blocks(self, monkeypatch):
+        monkeypatch.setattr(fizz_buzz_solution, 'BLOCK_SIZE', 30)
+        assert list(fizz_buzz_range(7, 200)) == [_naive(n) for n in range(7, 200)]
+
+    def test_is_lazy(self):
+        results = fizz_buzz_range(1, 10 ** 15)
+        assert next(results) == '1'
+        assert next(results) == '2'
+        assert next(results) == 'fizz'
+
+
+class TestFillFizzBuzz():
+
+    def test_fills_preallocated_list(self):
+        out = [None] * 31
+        assert fill_fizz_buzz(out, 100) is out
+        assert out == [_naive(n) for n in range(100, 131)]
+
+    def test_empty_list(self):
+        assert fill_fizz_buzz([], 3) == []
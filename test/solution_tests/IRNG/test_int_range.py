@@ -0,0 +1,73 @@
+import json
+import tracemalloc
+
+from solutions.IRNG.int_range import IntRange, generate
+
+
+class TestGenerate():
+
+    def test_elements(self):
+        assert list(generate(3, 8)) == [3, 4, 5, 6, 7]
+
+    def test_empty(self):
+        assert list(generate(5, 5)) == []
+        assert list(generate(5, 2)) == []
+
+    def test_huge_range_is_not_materialised(self):
+        tracemalloc.start()
+        values = generate(0, 10 ** 12)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert peak < 10 ** 4
+        assert len(values) == 10 ** 12
+        assert values[-1] == 10 ** 12 - 1
+        assert 123456789012 in values
+        assert 10 ** 12 not in values
+        assert values.index(42) == 42
+
+
+class TestIntRange():
+
+    def test_indexing(self):
+        values = IntRange(10, 20)
+        assert values[0] == 10
+        assert values[-1] == 19
+
+    def test_slicing_returns_int_range(self):
+        values = IntRange(0, 100)[10:50:5]
+        assert isinstance(values, IntRange)
+        assert list(values) == list(range(0, 100))[10:50:5]
+        assert list(values[::-1]) == list(range(10, 50, 5))[::-1]
+
+    def test_contains_only_members(self):
+        values = IntRange(0, 10)
+        assert 9 in values
+        assert 10 not in values
+        assert 2.5 not in values
+
+    def test_equality(self):
+        assert IntRange(0, 5) == IntRange(0, 5)
+        assert IntRange(0, 0) == IntRange(3, 3)
+        assert IntRange(0, 5) != [0, 1, 2, 3, 4]
+
+    def test_iter_chunks(self):
+        chunks = list(IntRange(0, 10).iter_chunks(4))
+        assert [list(chunk) for chunk in chunks] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+    def test_iter_arrays(self):
+        arrays = list(IntRange(0, 5).iter_arrays(3))
+        assert [a.tolist() for a in arrays] == [[0, 1, 2], [3, 4]]
+
+    def test_iter_json(self):
+        for values in (IntRange(0, 0), IntRange(-3, 4), IntRange(0, 100)[::7]):
+            assert json.loads(''.join(values.iter_json(chunk_size=2))) == list(values)
+
+    def test_to_array_supports_buffer_protocol(self):
+        view = memoryview(IntRange(-2, 3).to_array())
+        assert view.format == 'q'
+        assert view.tolist() == [-2, -1, 0, 1, 2]
+
+    def test_to_numpy(self):
+        assert IntRange(5, 10).to_numpy().tolist() == [5, 6, 7, 8, 9]
+        assert IntRange(10, 5).to_numpy().tolist() == []
+        assert IntRange(0, 20)[3:15:4].to_numpy().tolist() == [3, 7, 11]